@@ -0,0 +1,50 @@
+import argparse
+import json
+import sys
+
+from utils.maze_generator import AVAILABLE_BACKENDS
+from utils.benchmark import BENCHMARKS, DEFAULT_SIZES, compare, run_benchmarks
+
+def main():
+    parser = argparse.ArgumentParser(description="Time maze generation, pathfinding, monster updates and drawing "
+                                                 "at several grid sizes with fixed seeds")
+    parser.add_argument("-o", "--out", default="benchmark.json", help="results file (JSON)")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative change of the median counted as slower/faster (default 0.10)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="maze cols/rows (odd)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, the median is compared")
+    parser.add_argument("--backend", choices=AVAILABLE_BACKENDS, default="prim", help="maze generator")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run just these benchmarks")
+    args = parser.parse_args()
+
+    def progress(name, result):
+        print(f"{name:<28}{result['median'] * 1000:10.3f} ms  (min {result['min'] * 1000:.3f})", file=sys.stderr)
+
+    current = run_benchmarks(args.sizes, seed=args.seed, repeat=args.repeat, backend=args.backend,
+                             names=args.only, progress=progress)
+
+    slower = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(current, baseline, args.threshold)
+        current["baseline"] = {"file": args.baseline, "meta": baseline.get("meta"), "threshold": args.threshold,
+                               "comparison": [{"name": name, "baseline": base, "current": now, "ratio": ratio,
+                                               "status": status} for name, base, now, ratio, status in rows]}
+        print(f"\n{'benchmark':<28}{'baseline':>12}{'current':>12}{'change':>9}")
+        for name, base, now, ratio, status in rows:
+            flag = "" if status == "same" else f"  {status}"
+            print(f"{name:<28}{base * 1000:10.3f}ms{now * 1000:10.3f}ms{ratio - 1:+9.1%}{flag}")
+        slower = [row[0] for row in rows if row[4] == "slower"]
+
+    with open(args.out, "w") as f:
+        json.dump(current, f, indent=1)
+    print(f"\nresults written to {args.out}", file=sys.stderr)
+    if slower:
+        print(f"{len(slower)} benchmark(s) slower than the baseline: {', '.join(slower)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,49 @@
 import pygame
 import random
-import math
 import time
-from pygame import mixer
 
-from utils.maze_generator import Maze
 from utils.player import Player
-from utils.monster import Monster
+from utils.monster import MonsterGroup, MonsterList
+from utils.chunked_maze import ChunkedMaze
+from utils.camera import Camera
+from utils.maze_pool import MazePool
+from utils.flow_field import DistanceField, field_radius
+from utils.text_cache import TextCache
+from utils.assets import assets
+from utils.audio import SoundManager, distance_volume
+from utils.profiler import FrameProfiler
+from utils.replay import ReplayWriter, MoveCursor, SNAPSHOT_INTERVAL, pack_state
     
 class Game:
-    def __init__(self):
-        pygame.init()
-        mixer.init()  # Initialize sound mixer
+    def __init__(self, tick_rate=60, max_fps=60, vsync=False, endless=False, maze_size=None, maze_backend="prim",
+                 dirty_rects=False, started_at=None, profile=False, profile_out=None, record_dir=None,
+                 replay=None, replay_speed=1.0, monster_count=1):
+        # Startup timing: started_at lets the caller include interpreter and import time
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.time_to_menu = None  # seconds until the first menu frame is on screen
+        self.assets_cached = None  # (images, sounds, fonts) held when the run ended
+        # Only the modules the menu needs; the mixer starts when the first sound is loaded
+        pygame.display.init()
+        pygame.font.init()
+        
+        # Replays: record_dir logs every game's inputs; a loaded Replay is played back instead of
+        # taking input, replay_speed times faster than real time, on the recorded maze and tick rate
+        self.record_dir = record_dir
+        self.recorder = None
+        self.replay = replay
+        self.replay_speed = replay_speed
+        self.replay_moves = None
+        self.tick = 0  # sim ticks run in the current game
+        if replay is not None:
+            endless, maze_size, tick_rate = replay.endless, replay.cols, replay.tick_rate
          
          # Text system setup
         self.BG_COLOR = (30, 30, 50)  # Dark blue background
         self.TEXT_COLOR = (255, 215, 0)  # Gold text
-        self.font_large = pygame.font.SysFont('Orbitron', 60)
-        self.font_medium = pygame.font.SysFont('Orbitron', 40) 
-        self.font_small = pygame.font.SysFont('Orbitron', 20)
+        self.text_cache = TextCache()  # rendered labels, reused across frames
+        self.hud_text = None  # timer string currently rendered into hud_surface
+        self.hud_surface = None
+        self.hud_pos = (0, 0)
         self.final_time = 0
             
         # Screen setup
@@ -28,14 +53,45 @@ class Game:
         self.MAZE_WIDTH =  600
         self.MAZE_COLS = (self.MAZE_WIDTH + self.CELL_SIZE)  // self.CELL_SIZE  # 800 / 20 = 40 cols
         self.MAZE_ROWS = (self.MAZE_HEIGHT + self.CELL_SIZE) // self.CELL_SIZE  # 600 / 20 = 30 rows
-        self.screen = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+        if maze_size:
+            # Bigger than the window is fine: the camera scrolls with the player
+            self.MAZE_COLS = self.MAZE_ROWS = maze_size | 1  # odd, so the outer wall is complete
+        # Game logic runs at a fixed tick rate; rendering runs as fast as MAX_FPS allows (0 = uncapped)
+        self.TICK_RATE = tick_rate
+        self.SIM_DT = 1.0 / tick_rate
+        self.MAX_FPS = max_fps
+        self.MAX_FRAME_TIME = 0.25  # drop sim time after long stalls instead of spiralling
+        self.IDLE_FPS = 20  # loop rate while a static screen (menu, game over) is up
+        # Dirty-rect mode: gameplay frames repaint and push only the regions sprites and the HUD touched
+        self.DIRTY_RECTS = dirty_rects
+        self.drawn_screen = None  # what the display shows now; static screens are skipped until it changes
+        self.full_frame = False  # this frame repainted everything, so flip the whole display
+        self.dirty = []  # otherwise only these screen rects changed
+        self.sprite_rects = []  # where player/monsters were drawn last frame
+        self.camera_pos = None
+        if vsync:
+            self.screen = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT), pygame.SCALED, vsync=1)
+        else:
+            self.screen = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
         
         self.maze_rect = pygame.Rect(0, 0, self.MAZE_WIDTH, self.MAZE_HEIGHT)
         self.maze_rect.center = (self.SCREEN_WIDTH//2, self.SCREEN_HEIGHT//2)
-        self.tile_img = pygame.image.load('assets/tiles/tiles_1.png').convert_alpha()
-        self.tile_img = pygame.transform.scale(self.tile_img, (self.CELL_SIZE, self.CELL_SIZE))
-        self.last_frame_time = time.time()
+        self.tile_img = None  # loaded with the first game, see initialize_game
+        self.render_alpha = 0.0  # fraction of a sim tick elapsed since the last logic step
         self.DEBUG_MODE = False  # Set to True to see collision boxes
+        # Frame profiler: per-phase timings, F3 toggles the overlay, exported to profile_out on exit
+        self.profiler = FrameProfiler(enabled=profile or bool(profile_out))
+        self.profile_out = profile_out
+        self.show_profiler = self.profiler.enabled
+        self.MONSTER_COUNT = monster_count  # monsters spawned per game (replays bring their own)
+        self.ENDLESS = endless  # streaming chunked maze with no exit, survive as long as you can
+        self.camera = self.make_camera()
+        
+        # Buttons never move, so their rects are built once
+        self.play_button = pygame.Rect(0, 0, 200, 60)
+        self.play_button.center = (self.SCREEN_WIDTH//2, 400)
+        self.restart_button = pygame.Rect(0, 0, 200, 60)
+        self.restart_button.center = (self.SCREEN_WIDTH//2, 450)
             
         pygame.display.set_caption("Maze Escape: Monster Chase")
         
@@ -44,17 +100,18 @@ class Game:
         self.game_result = None  # "escaped" or "caught"
         
         # Resources
-        self.font_large = pygame.font.SysFont("Arial", 60)
-        self.font_medium = pygame.font.SysFont("Arial", 30)
-        self.font_small = pygame.font.SysFont("Arial", 20)
-        
-        # Sound placeholders
-        self.sounds = {
-            "bg_music": 'sounds/music.wav',
-            "growl": None,     # "assets/sounds/growl.wav"
-            "scream": None,     # "assets/sounds/scream.wav"
-            "win": None         # "assets/sounds/win.wav"
-        }
+        self.font_large = assets.font("Arial", 60)
+        self.font_medium = assets.font("Arial", 30)
+        self.font_small = assets.font("Arial", 20)
+        self.font_debug = assets.font("couriernew,monospace", 14) if self.profiler.enabled else None
+        
+        # Sounds: clips are decoded once when the first game loads; missing files stay silent
+        self.MUSIC_PATH = 'sounds/music.wav'
+        self.audio = SoundManager({
+            "growl": "sounds/growl.wav",
+            "scream": "sounds/scream.wav",
+            "win": "sounds/win.wav",
+        })
         
         # Game tips
         self.tips = [
@@ -64,93 +121,143 @@ class Game:
             "Quick escapes give better scores!"
         ]
         
-        # Game elements (initialized later)
-        self.player =  Player(1, 1, self.CELL_SIZE)  # Start position (1,1)
-        self.monster = Monster( x=random.randint(3, self.MAZE_COLS-2), y=random.randint(3, self.MAZE_ROWS-2), cell_size = self.CELL_SIZE)
-        self.maze = Maze(self.MAZE_COLS, self.MAZE_ROWS, self.CELL_SIZE)
+        # Game elements (created by initialize_game)
+        self.player = None
+        self.maze = None
+        self.monsters = None
+        self.distance_field = None
+        self.field_radius = None  # bound of distance_field, None = whole maze (see utils/flow_field.py)
         self.start_time = 0
+        
+        # Mazes are generated in the background while menu/loading screens are up (replays bring their own)
+        self.maze_pool = MazePool(self.MAZE_COLS, self.MAZE_ROWS, self.CELL_SIZE, backend=maze_backend)
+        if replay is None:
+            self.maze_pool.start()
+        else:
+            self.start_loading()
     
     
     
     def load_image(self, path, size=None):
-        """Load and optionally scale an image"""
-        try:
-            img = pygame.image.load('assets/Player/player_walk_1.png').convert_alpha()
-            return pygame.transform.scale(img, (size, size)) if size else img
-        except:
-            # Fallback colored square
-            surf = pygame.Surface((size, size)) if size else pygame.Surface((50, 50))
-            surf.fill((255, 0, 255))  # Magenta = missing asset
-            return surf    
+        """Load and optionally scale an image (cached, magenta square if missing)"""
+        return assets.image(path, (size, size) if size else None)
     
     def run(self):
         clock = pygame.time.Clock()
         running = True
+        accumulator = 0.0
+        profiler = self.profiler
         
         while running:
-            dt = clock.tick(60)/1000.0  # Delta time in seconds
+            with profiler.phase("wait"):
+                fps = self.IDLE_FPS if self.state in ("menu", "gameover") else self.MAX_FPS
+                frame_time = min(clock.tick(fps) / 1000.0, self.MAX_FRAME_TIME)  # Delta time in seconds
+            accumulator += frame_time * (self.replay_speed if self.replay else 1.0)
             
             # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                
-                elif event.type == pygame.KEYDOWN:
-                     self.player.handle_input(event, self.maze)
-                            
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if self.state == "menu" and self.play_button.collidepoint(event.pos):
-                        self.state = "loading"
-                        self.loading_progress = 0
-                        self.loading_tip = random.choice(self.tips)
-                        self.loading_start_time = time.time()
+            with profiler.phase("events"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        running = False
                     
-                    elif self.state == "gameover" and self.restart_button.collidepoint(event.pos):
-                        self.reset_game()
+                    elif event.type == pygame.VIDEOEXPOSE:
+                        self.drawn_screen = None  # window uncovered: repaint everything
+                    
+                    elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and profiler.enabled:
+                        self.show_profiler = not self.show_profiler
+                        self.drawn_screen = None  # repaint what the overlay covered
+                    
+                    elif event.type == pygame.KEYDOWN and self.state == "gameplay" and self.replay is None:
+                        move = self.player.handle_input(event, self.maze)
+                        if move and self.recorder:
+                            self.recorder.move(self.tick, *move)
+                                
+                    if event.type == pygame.MOUSEBUTTONDOWN:
+                        if self.state == "menu" and self.play_button.collidepoint(event.pos):
+                            self.start_loading()
+                        
+                        elif self.state == "gameover" and self.restart_button.collidepoint(event.pos):
+                            self.reset_game()
             
-            # Updates
-            self.player.update(dt)
-            self.monster.update(self.maze, (self.player.x, self.player.y), dt)
+            # Fixed-step logic: same dt every tick no matter the frame rate
+            while accumulator >= self.SIM_DT:
+                if self.state == "gameplay" and not (self.replay and self.tick >= self.replay.last_tick):
+                    if self.replay_moves:
+                        for _, dx, dy in self.replay_moves.due(self.tick):
+                            self.player.move(dx, dy, self.maze)
+                    self.tick_gameplay(self.SIM_DT)
+                accumulator -= self.SIM_DT
+            self.render_alpha = accumulator / self.SIM_DT
                 
-            # State updates
-            if self.state == "menu":
-                self.update_menu()
-            elif self.state == "loading":
-                self.update_loading()
-            elif self.state == "gameplay":
-                self.update_gameplay()
-            elif self.state == "gameover":
-                self.update_gameover()
+            # State updates (rendering)
+            if self.state == "gameplay":
+                self.update_gameplay()  # times its own phases
+            else:
+                with profiler.phase("ui"):
+                    if self.state == "menu":
+                        self.update_menu()
+                    elif self.state == "loading":
+                        self.update_loading()
+                    elif self.state == "gameover":
+                        self.update_gameover()
             
-            pygame.display.flip()
-            clock.tick(60)
+            with profiler.phase("flip"):
+                if self.full_frame:
+                    pygame.display.flip()
+                    if self.time_to_menu is None and self.drawn_screen == "menu":
+                        self.time_to_menu = time.perf_counter() - self.started_at
+                elif self.dirty:
+                    pygame.display.update(self.dirty)
+            self.full_frame = False
+            self.dirty = []
+            profiler.end_frame()
         
+        if self.recorder:
+            self.recorder.end(self.tick, "quit")  # window closed mid-game
+        if self.profile_out:
+            profiler.export(self.profile_out)
+        self.maze_pool.stop()
+        # Cached surfaces, sounds and fonts belong to this pygame session; a later Game must reload them
+        self.assets_cached = (len(assets.images), len(assets.sounds), len(assets.fonts))
+        assets.clear()
         pygame.quit()
 
+    def start_loading(self):
+        """Menu -> loading screen; the game starts once its maze is ready"""
+        self.state = "loading"
+        self.loading_progress = 0
+        self.loading_tip = random.choice(self.tips)
+        self.loading_start_time = time.time()
+        self.audio.preload()  # decode clips now rather than mid-game
+
     # --- State Methods ---
     def update_menu(self):
-        """Main menu screen"""
+        """Main menu screen (drawn once, nothing on it changes)"""
+        if self.drawn_screen == "menu":
+            return
+        self.drawn_screen = "menu"
+        self.full_frame = True
         self.screen.fill((30, 30, 50))
         
         # Title
-        title = self.font_large.render("Monster-Maze AI Game", True, (255, 215, 0))
+        title = self.text_cache.render(self.font_large, "Monster-Maze AI Game", (255, 215, 0))
         self.screen.blit(title, (self.SCREEN_WIDTH//2 - title.get_width()//2, 200))
         
         # Play button
-        self.play_button = pygame.Rect(0, 0, 200, 60)
-        self.play_button.center = (self.SCREEN_WIDTH//2, 400)
         pygame.draw.rect(self.screen, (0, 180, 0), self.play_button, border_radius=10)
-        play_text = self.font_medium.render("PLAY", True, (255, 255, 255))
+        play_text = self.text_cache.render(self.font_medium, "PLAY", (255, 255, 255))
         self.screen.blit(play_text, (self.play_button.centerx - play_text.get_width()//2, 
                                     self.play_button.centery - play_text.get_height()//2))
 
     def update_loading(self):
         """Loading screen with progress bar"""
+        self.drawn_screen = "loading"
+        self.full_frame = True
         self.screen.fill((20, 20, 40))
         
-        # Update progress (0-100 over 3 seconds)
-        elapsed = time.time() - self.loading_start_time
-        self.loading_progress = min(100, int(elapsed / 2 * 100))
+        # Real progress of the maze the pool is building for us (endless chunks stream in later)
+        ready = self.ENDLESS or self.replay is not None
+        self.loading_progress = 100 if ready else int(self.maze_pool.progress() * 100)
         
         # Progress bar
         bar_width = 200
@@ -158,114 +265,131 @@ class Game:
         pygame.draw.rect(self.screen, (0, 200, 100), (self.SCREEN_WIDTH//2 - bar_width//2, 300, bar_width * self.loading_progress//100, 30))
         
         # Progress text
-        progress_text = self.font_small.render(f"{self.loading_progress}%", True, (255, 255, 255))
+        progress_text = self.text_cache.render(self.font_small, f"{self.loading_progress}%", (255, 255, 255))
         self.screen.blit(progress_text, (self.SCREEN_WIDTH//2 - progress_text.get_width()//2, 340))
         
         # Random tip
-        tip_text = self.font_small.render(self.loading_tip, True, (200, 200, 200))
+        tip_text = self.text_cache.render(self.font_small, self.loading_tip, (200, 200, 200))
         self.screen.blit(tip_text, (self.SCREEN_WIDTH//2 - tip_text.get_width()//2, 400))
         
         # Complete loading
-        if self.loading_progress >= 100:
+        if ready or self.maze_pool.has_ready():
+            self.maze_pool.pause()  # refills would compete with gameplay for the CPU
             self.initialize_game()
             self.state = "gameplay"
             self.start_time = time.time()
             # Play BG music if available
-            if self.sounds["bg_music"]:
-                mixer.music.load(self.sounds["bg_music"])
-                mixer.music.play(-1)  # Loop indefinitely
+            self.audio.play_music(self.MUSIC_PATH)  # Loop indefinitely
 
-    def update_gameplay(self):
-        """Main game screen with all gameplay logic"""
-        
-        # Calculate delta time properly
-        current_time = time.time()
-        delta_time = current_time - self.last_frame_time
-        self.last_frame_time = current_time
+    def tick_gameplay(self, dt):
+        """One fixed-size step of gameplay logic"""
+        with self.profiler.phase("player"):
+            self.player.update(dt)
         
         # Update monster (chase logic)
-        self.monster.update(self.maze, (self.player.x, self.player.y), delta_time)
-        
-        # Draw everything
-        self.maze.draw(self.screen, self.tile_img, self.maze_rect)
-        self.player.draw(self.screen, self.maze_rect)
-        self.monster.draw(self.screen, self.maze_rect)
-        # Display timer (centered above maze)
-        elapsed = time.time() - self.start_time
-        minutes = int(elapsed // 60)
-        seconds = int(elapsed % 60)
-
-        # Create timer text
-        timer_text = self.font_medium.render(
-            f"TIME: {minutes:02d}:{seconds:02d}", 
-            True, 
-            (255, 255, 255)  # White text
-        )
-
-        # Calculate centered position
-        timer_x = self.maze_rect.centerx - timer_text.get_width() // 2
-        timer_y = self.maze_rect.top - 40  # 40 pixels above maze
-
-        # Draw with background for readability
-        pygame.draw.rect(
-            self.screen, 
-            (255, 255, 255),  # Same as maze bg
-            (timer_x - 10, timer_y - 5, 
-            timer_text.get_width() + 20, 
-            timer_text.get_height() + 10)
-        )
-        self.screen.blit(timer_text, (timer_x, timer_y))
+        self.update_monsters(dt)
+        self.tick += 1
                                         
-        # Collision detection (using Rect)
-        player_rect = pygame.Rect(
-            self.maze_rect.x + self.player.x * self.CELL_SIZE,
-            self.maze_rect.y + self.player.y * self.CELL_SIZE,
-            self.CELL_SIZE,
-            self.CELL_SIZE
-        )
-        
-        monster_rect = pygame.Rect(
-            self.maze_rect.x + self.monster.x * self.CELL_SIZE,
-            self.maze_rect.y + self.monster.y * self.CELL_SIZE,
-            self.CELL_SIZE,
-            self.CELL_SIZE
-        )
-        
-        # Check collisions
-        if player_rect.colliderect(monster_rect):
-            if self.sounds["scream"]:
-                self.sounds["scream"].play()
+        # Collision detection (cell occupancy lookup)
+        if self.monsters.occupies((self.player.x, self.player.y)):
             self.end_game("caught")
         
+        # Endless mode: keep the chunks around the player generated, there is no exit
+        elif self.ENDLESS:
+            self.maze.prefetch(self.player.x, self.player.y)
+        
         # Win condition (reached exit)
         elif (self.player.x, self.player.y) == (self.maze.cols-1, self.maze.rows-2):
-            self.final_time = time.time() - self.start_time
-            if self.sounds["win"]:
-                self.sounds["win"].play()
+            self.final_time = self.elapsed()
             self.end_game("escaped")
         
+        # Periodic state snapshot so a replay can seek without re-simulating from the start
+        if self.recorder and self.state == "gameplay" and self.tick % SNAPSHOT_INTERVAL == 0:
+            self.recorder.snapshot(self.tick, pack_state(self.player, self.monsters, self.distance_field))
+
+    def update_gameplay(self):
+        """Main game screen (drawing only, logic lives in tick_gameplay)"""
+        
+        # Camera follows the player; only visible tiles and entities are drawn
+        self.camera.follow(self.player.x, self.player.y)
+        world_rect = self.camera.world_rect()
+        camera_pos = (self.camera.x, self.camera.y)
+        full = (not self.DIRTY_RECTS or self.DEBUG_MODE or self.drawn_screen != "gameplay"
+                or camera_pos != self.camera_pos)
+        self.drawn_screen = "gameplay"
+        self.camera_pos = camera_pos
+        
+        with self.profiler.phase("maze.draw"):
+            if full:
+                # Draw everything
+                self.full_frame = True
+                self.maze.draw(self.screen, self.tile_img, self.camera.view_rect, self.camera)
+            else:
+                # Paint the maze back over last frame's sprites from the cached chunk surfaces
+                for rect in self.sprite_rects:
+                    self.screen.set_clip(rect)
+                    self.maze.draw(self.screen, self.tile_img, self.camera.view_rect, self.camera)
+                self.dirty.extend(self.sprite_rects)
+        with self.profiler.phase("entities.draw"):
+            self.screen.set_clip(self.camera.view_rect)
+            self.sprite_rects = [self.player.draw(self.screen, world_rect)]
+            self.sprite_rects += self.monsters.draw(self.screen, world_rect, self.render_alpha, self.camera)
+            self.screen.set_clip(None)
+        self.dirty.extend(self.sprite_rects)
+        
+        # Display timer (centered above maze); the HUD is only re-rendered when the second changes
+        elapsed = self.elapsed()
+        minutes = int(elapsed // 60)
+        seconds = int(elapsed % 60)
+        hud_text = f"TIME: {minutes:02d}:{seconds:02d}"
+        if hud_text != self.hud_text or full:
+            old_rect = self.hud_surface.get_rect(topleft=self.hud_pos) if self.hud_surface else None
+            if hud_text != self.hud_text:
+                self.render_hud(hud_text)
+            hud_rect = self.screen.blit(self.hud_surface, self.hud_pos)
+            self.dirty.append(hud_rect.union(old_rect) if old_rect else hud_rect)
+        
         # Optional: Visual debug for collision boxes
         if self.DEBUG_MODE:
-            pygame.draw.rect(self.screen, (255, 0, 0), player_rect, 1)
-            pygame.draw.rect(self.screen, (0, 0, 255), monster_rect, 1)
+            size = self.CELL_SIZE
+            pygame.draw.rect(self.screen, (255, 0, 0), (world_rect.x + self.player.x * size,
+                                                        world_rect.y + self.player.y * size, size, size), 1)
+            for mx, my in self.monsters.positions():
+                pygame.draw.rect(self.screen, (0, 0, 255), (world_rect.x + mx * size,
+                                                            world_rect.y + my * size, size, size), 1)
+        
+        # Profiler overlay (top-left, opaque so dirty-rect frames can simply draw over it)
+        if self.show_profiler:
+            self.dirty.append(self.screen.blit(self.profiler.overlay(self.font_debug), (5, 5)))
+
+    def render_hud(self, hud_text):
+        """Timer text on its background box, pre-composed into one surface"""
+        timer_text = self.text_cache.render(self.font_medium, hud_text, (255, 255, 255))  # White text
+        
+        # Draw with background for readability
+        self.hud_surface = pygame.Surface((timer_text.get_width() + 20, timer_text.get_height() + 10))
+        self.hud_surface.fill((255, 255, 255))  # Same as maze bg
+        self.hud_surface.blit(timer_text, (10, 5))
+        
+        # Calculate centered position, 40 pixels above maze
+        self.hud_pos = (self.maze_rect.centerx - timer_text.get_width() // 2 - 10, self.maze_rect.top - 40 - 5)
+        self.hud_text = hud_text
 
     def update_gameover(self):
-        """Game over screen (win/lose)"""
+        """Game over screen (win/lose), drawn once per result"""
+        if self.drawn_screen == ("gameover", self.game_result):
+            return
+        self.drawn_screen = ("gameover", self.game_result)
+        self.full_frame = True
         self.screen.fill((0, 0, 30))
         
         # Result message
         if self.game_result == "escaped":
-            msg = self.font_large.render("ESCAPE SUCCESS!", True, (0, 255, 0))
-            sub_msg = self.font_medium.render("Can you beat your time?", True, (200, 255, 200))
-            # Play win sound if available
-            if self.sounds["win"]:
-                mixer.Sound.play(self.sounds["win"])
+            msg = self.text_cache.render(self.font_large, "ESCAPE SUCCESS!", (0, 255, 0))
+            sub_msg = self.text_cache.render(self.font_medium, "Can you beat your time?", (200, 255, 200))
         else:
-            msg = self.font_large.render("YOU WERE CAUGHT!", True, (255, 0, 0))
-            sub_msg = self.font_medium.render("The monster got you...", True, (255, 200, 200))
-            # Play scream sound if available
-            if self.sounds["scream"]:
-                mixer.Sound.play(self.sounds["scream"])
+            msg = self.text_cache.render(self.font_large, "YOU WERE CAUGHT!", (255, 0, 0))
+            sub_msg = self.text_cache.render(self.font_medium, "The monster got you...", (255, 200, 200))
             
         self.screen.blit(msg, (self.SCREEN_WIDTH//2 - msg.get_width()//2, 200))
         self.screen.blit(sub_msg, (self.SCREEN_WIDTH//2 - sub_msg.get_width()//2, 280))
@@ -273,50 +397,130 @@ class Game:
         if self.game_result == "escaped":
             minutes = int(self.final_time) // 60
             seconds = int(self.final_time) % 60
-            time_text = self.font_medium.render(
+            time_text = self.text_cache.render(
+                self.font_medium,
                 f"Escaped in: {minutes:02d}:{seconds:02d}",  # Formatted time
-                True, 
                 (255, 255, 0)
             )
             self.screen.blit(time_text, (self.SCREEN_WIDTH//2 - time_text.get_width()//2, 350))
                     
         # Restart button
-        self.restart_button = pygame.Rect(0, 0, 200, 60)
-        self.restart_button.center = (self.SCREEN_WIDTH//2, 450)
         pygame.draw.rect(self.screen, (0, 150, 200), self.restart_button, border_radius=10)
-        restart_text = self.font_medium.render("RESTART", True, (255, 255, 255))
+        restart_text = self.text_cache.render(self.font_medium, "RESTART", (255, 255, 255))
         self.screen.blit(restart_text, (self.restart_button.centerx - restart_text.get_width() // 2, 
                                        self.restart_button.centery - restart_text.get_height() // 2))
-        minutes = int(time.time()) // 60
-        seconds = int(time.time()) % 60
        
        
     # --- Game Logic ---
     def initialize_game(self):
         """Initialize game objects"""
         self.start_time = time.time()
-        self.maze = Maze(self.MAZE_COLS, self.MAZE_ROWS, self.CELL_SIZE)
-        self.maze.generate_maze()
         
         # Place player at start (1,1)
         self.player = Player(1, 1, self.CELL_SIZE)
+        self.tile_img = assets.image('assets/tiles/tiles_1.png', (self.CELL_SIZE, self.CELL_SIZE))
+        self.tick = 0
         
-        # Place monster randomly
-        monster_x, monster_y = random.randint(3, self.MAZE_COLS - 2), random.randint(3, self.MAZE_ROWS - 2)
-        while self.maze.grid[monster_y][monster_x] == 1 or math.hypot(monster_x - 1, monster_y - 1) < 10:
-            monster_x, monster_y = random.randint(3, self.MAZE_COLS - 2), random.randint(3, self.MAZE_ROWS - 2)
-
-        self.monster = Monster(monster_x, monster_y, self.CELL_SIZE)
+        if self.replay is not None:
+            # Same maze (from its seed) and monster spawns as the recorded game, inputs from the log
+            self.maze = self.replay.build_maze(self.CELL_SIZE)
+            self.field_radius = self.replay.field_radius
+            self.distance_field = None if self.ENDLESS else DistanceField(self.maze, self.field_radius)
+            self.monsters = self.replay.build_monsters(self.maze, self.CELL_SIZE, 'assets/Monster/monster.png')
+            self.replay_moves = MoveCursor(self.replay.moves)
+        elif self.ENDLESS:
+            # Chunks are generated on demand; monsters path-find individually over them
+            self.maze = ChunkedMaze(self.CELL_SIZE)
+            self.field_radius = None
+            self.distance_field = None
+            # Respawns draw from the maze seed, so the log's seed and spawns reproduce them
+            self.monsters = MonsterList(self.maze, self.CELL_SIZE, rng=random.Random(self.maze.seed))
+            self.monsters.spawn_near((1, 1), random, self.MONSTER_COUNT)
+        else:
+            self.maze = self.maze_pool.get()  # already generated by the pool
+            self.field_radius = field_radius(self.maze)  # bounded on huge mazes
+            self.distance_field = DistanceField(self.maze, self.field_radius)
+            
+            # Place monsters randomly, within the bounded field's reach
+            self.monsters = MonsterGroup(self.maze, self.CELL_SIZE)
+            self.monsters.spawn_random(self.maze, random, self.MONSTER_COUNT, max_distance=self.field_radius)
+        if self.ENDLESS:
+            self.maze.prefetch(1, 1)
+        else:
+            self.distance_field.update((1, 1))  # a bounded field's whole-maze search runs now, not on tick 1
+        
+        if self.record_dir and self.replay is None:
+            self.recorder = ReplayWriter.in_directory(self.record_dir, self.TICK_RATE, self.maze, self.ENDLESS,
+                                                      self.field_radius)
+            self.recorder.spawn(self.monsters.positions())
         
         # Play growl sound if available
-        if self.sounds["growl"]:
-            mixer.Sound.play(self.sounds["growl"])
+        self.audio.play("growl")
+
+    def print_startup_report(self):
+        """Time-to-menu and what the asset cache loaded, for tracking startup cost"""
+        if self.time_to_menu is not None:
+            print(f"time to menu:  {self.time_to_menu * 1000:.0f} ms")
+        images, sounds, fonts = self.assets_cached or (len(assets.images), len(assets.sounds), len(assets.fonts))
+        print(f"assets loaded: {assets.loads} in {assets.load_time * 1000:.0f} ms "
+              f"({images} images, {sounds} sounds, {fonts} fonts cached)")
+
+    def make_camera(self):
+        """Camera over the play area; a maze that fits the window keeps its usual spot and never scrolls"""
+        if self.ENDLESS:
+            return Camera(self.maze_rect, self.CELL_SIZE)
+        world_w, world_h = self.MAZE_COLS * self.CELL_SIZE, self.MAZE_ROWS * self.CELL_SIZE
+        if (self.maze_rect.x + world_w <= self.SCREEN_WIDTH
+                and self.maze_rect.y + world_h <= self.SCREEN_HEIGHT):
+            view = pygame.Rect(self.maze_rect.topleft, (world_w, world_h))
+        else:
+            view = self.maze_rect
+        return Camera(view, self.CELL_SIZE, (self.MAZE_COLS, self.MAZE_ROWS))
+
+    def update_monsters(self, dt):
+        """Refresh the shared distance field once, then step all monsters as a batch"""
+        player_pos = (self.player.x, self.player.y)
+        profiler = self.profiler
+        if profiler.enabled:
+            searches, nodes = self.search_stats()
+        with profiler.phase("monsters.bfs"):
+            if self.distance_field is not None:
+                self.distance_field.update(player_pos, self.monsters.replan_distance)  # no-op unless the player moved
+        with profiler.phase("monsters.move"):
+            self.monsters.update(player_pos, dt, self.distance_field)
+        if profiler.enabled:
+            searches_now, nodes_now = self.search_stats()
+            profiler.count("bfs", searches_now - searches)
+            profiler.count("nodes", nodes_now - nodes)
+        
+        # Growl when a monster escalates its FSM state, louder the closer it is
+        for _, old_state, new_state, distance in self.monsters.events:
+            if new_state > old_state:
+                self.audio.play("growl", distance_volume(distance))
+
+    def elapsed(self):
+        """Seconds played; replays count sim ticks since they run faster than the clock"""
+        if self.replay is not None:
+            return self.tick * self.SIM_DT
+        return time.time() - self.start_time
+
+    def search_stats(self):
+        """(searches, cells expanded) so far: the shared distance field, or per-monster planners when endless"""
+        if self.distance_field is not None:
+            return self.distance_field.computes, self.distance_field.expanded_total
+        return self.monsters.search_stats()
 
     def end_game(self, result):
         """Transition to game over screen"""
         self.state = "gameover"
         self.game_result = result
-        mixer.music.stop()  # Stop background music
+        self.maze_pool.resume()  # refill while the game over and menu screens are up
+        if self.recorder:
+            self.recorder.end(self.tick, result)
+            self.recorder = None
+        self.audio.stop_music()  # Stop background music
+        # Played once on the transition, not while the game over screen is up
+        self.audio.play("scream" if result == "caught" else "win")
 
     def reset_game(self):
         """Reset game state"""
@@ -1,6 +1,36 @@
+import argparse
+import time
+
+STARTED_AT = time.perf_counter()  # before the pygame import, so time-to-menu covers it
+
 from game import Game
+from utils.maze_generator import AVAILABLE_BACKENDS
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="Maze Escape: Monster Chase")
+    parser.add_argument("--tick-rate", type=int, default=60, help="game logic steps per second")
+    parser.add_argument("--fps", type=int, default=60, help="render frame cap, 0 = uncapped")
+    parser.add_argument("--vsync", action="store_true", help="sync rendering to the display refresh rate")
+    parser.add_argument("--size", type=int, default=None, help="maze cols/rows, larger mazes scroll")
+    parser.add_argument("--monsters", type=int, default=1, help="monsters spawned per game")
+    parser.add_argument("--backend", choices=AVAILABLE_BACKENDS, default="prim", help="maze generator (numpy is faster for big mazes)")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="repaint and push only the screen regions that changed (lower CPU use)")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print time-to-menu and asset loading stats on exit")
+    parser.add_argument("--profile", action="store_true", help="time every frame phase, F3 toggles the overlay")
+    parser.add_argument("--profile-out", metavar="FILE", help="export frame timings on exit (.json or .csv)")
+    parser.add_argument("--record", metavar="DIR", help="save a replay log of every game into DIR (see replay.py)")
+    parser.add_argument("--endless", action="store_true", help="endless streaming maze, survive as long as you can")
+    args = parser.parse_args()
+    if args.size is not None and args.size < 11:
+        parser.error("--size must be at least 11, monsters spawn 10 cells from the start")
+    if args.monsters < 1:
+        parser.error("--monsters must be at least 1")
 
+    game = Game(tick_rate=args.tick_rate, max_fps=args.fps, vsync=args.vsync, endless=args.endless, maze_size=args.size,
+                monster_count=args.monsters, maze_backend=args.backend, dirty_rects=args.dirty_rects,
+                started_at=STARTED_AT, profile=args.profile, profile_out=args.profile_out, record_dir=args.record)
+    game.run()
+    if args.startup_report:
+        game.print_startup_report()
@@ -0,0 +1,38 @@
+import argparse
+import os
+import time
+
+from utils.maze_generator import AVAILABLE_BACKENDS, Maze
+from utils.maze_io import MazePack, save_pack
+from utils.simulation import DEFAULT_SIZE
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect a binary level pack of seeded mazes")
+    parser.add_argument("path", help="pack file to write (or read with --info)")
+    parser.add_argument("-n", "--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="maze i uses seed + i")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="maze cols/rows (odd)")
+    parser.add_argument("--backend", choices=AVAILABLE_BACKENDS, default="prim", help="maze generator")
+    parser.add_argument("--no-distances", action="store_true", help="skip the precomputed distance-to-exit data")
+    parser.add_argument("--info", action="store_true", help="print what an existing pack holds")
+    args = parser.parse_args()
+
+    if args.info:
+        start = time.perf_counter()
+        pack = MazePack(args.path, cell_size=1)
+        sizes = {(maze.cols, maze.rows) for maze in pack}
+        print(f"{len(pack)} mazes, sizes {sorted(sizes)}, decoded in {time.perf_counter() - start:.3f}s")
+        return
+
+    start = time.perf_counter()
+    mazes = []
+    for i in range(args.count):
+        maze = Maze(args.size, args.size, 1, seed=args.seed + i, backend=args.backend)
+        maze.generate_maze()
+        mazes.append(maze)
+    save_pack(mazes, args.path, distances=not args.no_distances)
+    print(f"wrote {args.count} mazes to {args.path} ({os.path.getsize(args.path)} bytes) "
+          f"in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
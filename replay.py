@@ -0,0 +1,51 @@
+import argparse
+import sys
+import time
+
+from utils.replay import Replay, ReplaySim
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back replay logs recorded with main.py --record")
+    parser.add_argument("logs", nargs="+", help="replay logs (.mzr)")
+    parser.add_argument("--verify", action="store_true",
+                        help="fail (exit 1) if a re-simulated game ends differently from the recording")
+    parser.add_argument("--check-walls", action="store_true",
+                        help="report ticks where the player or a monster stands in a wall or a monster skips cells")
+    parser.add_argument("--seek", type=int, metavar="TICK", help="print player and monster cells at this tick")
+    parser.add_argument("--render", action="store_true", help="watch the (first) log in the game window")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed for --render, e.g. 4 = 4x")
+    args = parser.parse_args()
+
+    if args.render:
+        from game import Game
+        Game(replay=Replay(args.logs[0]), replay_speed=args.speed).run()
+        return
+
+    failed = 0
+    for path in args.logs:
+        replay = Replay(path)
+        sim = ReplaySim(replay)
+        if args.seek is not None:
+            start = time.perf_counter()
+            tick = sim.seek(args.seek)
+            print(f"{path}: tick {tick} ({(time.perf_counter() - start) * 1000:.1f} ms)  "
+                  f"player {sim.positions()[0]}  monsters {sim.positions()[1:]}")
+            continue
+
+        start = time.perf_counter()
+        outcome = sim.run(check=args.check_walls)
+        wall_time = time.perf_counter() - start
+        line = (f"{path}: {outcome['result']} at tick {outcome['ticks']} "
+                f"({outcome['ticks'] / replay.tick_rate:.1f}s of play in {wall_time:.2f}s)")
+        if replay.end and (outcome["ticks"], outcome["result"]) != replay.end:
+            line += f"  MISMATCH: recorded {replay.end[1]} at tick {replay.end[0]}"
+            failed += args.verify
+        print(line)
+        for tick, who, old, new in outcome["problems"]:
+            print(f"  tick {tick}: {who} {old} -> {new}")
+        failed += args.check_walls and bool(outcome["problems"])
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
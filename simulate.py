@@ -0,0 +1,43 @@
+import argparse
+import time
+
+from utils.maze_generator import AVAILABLE_BACKENDS
+from utils.maze_io import MazePack
+from utils.simulation import POLICIES, DEFAULT_SIZE, SIM_DT, run_episodes, summarize
+
+def main():
+    parser = argparse.ArgumentParser(description="Run seeded chase episodes headless (no window, no assets)")
+    parser.add_argument("-n", "--episodes", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="episode i uses seed + i")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="maze cols/rows (odd)")
+    parser.add_argument("--monsters", type=int, default=1)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="evade")
+    parser.add_argument("--player-speed", type=float, default=6.0, help="player moves per second")
+    parser.add_argument("--time-limit", type=float, default=120.0, help="simulated seconds per episode")
+    parser.add_argument("--dt", type=float, default=SIM_DT, help="fixed simulated timestep in seconds")
+    parser.add_argument("--backend", choices=AVAILABLE_BACKENDS, default="prim", help="maze generator")
+    parser.add_argument("--field-radius", type=int, default=None,
+                        help="bound the monsters' distance field to this many cells, as the game does on "
+                             "mazes over 101x101 (default: whole maze)")
+    parser.add_argument("--pack", help="play mazes from a level pack (see maze_pack.py) instead of generating them")
+    args = parser.parse_args()
+    pack = MazePack(args.pack, cell_size=1) if args.pack else None
+
+    start = time.perf_counter()
+    try:
+        results = run_episodes(args.episodes, seed=args.seed, size=args.size, monster_count=args.monsters,
+                               policy=args.policy, player_speed=args.player_speed, time_limit=args.time_limit,
+                               dt=args.dt, backend=args.backend, field_radius=args.field_radius, pack=pack)
+    except ValueError as e:  # e.g. a maze too small to spawn monsters in
+        parser.error(str(e))
+    wall_time = time.perf_counter() - start
+    summary = summarize(results)
+
+    print(f"episodes:      {summary['episodes']} ({summary['episodes'] / wall_time:.0f}/s)")
+    print(f"capture rate:  {summary['capture_rate']:.1%} "
+          f"(caught {summary['caught']}, escaped {summary['escaped']}, timeout {summary['timeout']})")
+    if summary["mean_escape_time"] is not None:
+        print(f"escape time:   mean {summary['mean_escape_time']:.2f}s, median {summary['median_escape_time']:.2f}s")
+
+if __name__ == "__main__":
+    main()
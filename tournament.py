@@ -0,0 +1,58 @@
+import argparse
+import csv
+import sys
+import time
+
+from utils.simulation import POLICIES, DEFAULT_SIZE
+from utils.tournament import SPEED_PARAMS, THRESHOLD_PARAMS, run_tournament
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep monster AI parameters over seeded headless episodes")
+    parser.add_argument("-o", "--out", default="tournament.jsonl", help="per-episode results (appended, resumable)")
+    parser.add_argument("--summary", help="optional CSV with one row per configuration")
+    parser.add_argument("-n", "--episodes", type=int, default=200, help="episodes per configuration")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=25, help="episodes per work unit")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    parser.add_argument("--monsters", type=int, default=1)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="evade")
+    parser.add_argument("--player-speed", type=float, default=6.0)
+    parser.add_argument("--time-limit", type=float, default=120.0)
+    # Parameter grid: every flag takes one or more values
+    for name in SPEED_PARAMS:
+        parser.add_argument(f"--{name}", type=float, nargs="+", help=f"{name} speed(s) in cells per second")
+    for name in THRESHOLD_PARAMS:
+        parser.add_argument(f"--{name}", type=int, nargs="+", help=f"FSM '{name}' distance threshold(s)")
+    parser.add_argument("--replan", type=int, nargs="+", help="path replan tolerance(s) in cells")
+    args = parser.parse_args()
+
+    sweep = {name: getattr(args, name) for name in SPEED_PARAMS + THRESHOLD_PARAMS + ("replan",)
+             if getattr(args, name)}
+    options = {"size": args.size, "monster_count": args.monsters, "policy": args.policy,
+               "player_speed": args.player_speed, "time_limit": args.time_limit}
+
+    def progress(finished, total):
+        print(f"\r{finished}/{total} chunks", end="", file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    summaries = run_tournament(sweep, args.episodes, args.out, seed=args.seed, options=options,
+                               jobs=args.jobs, chunk_size=args.chunk_size, progress=progress)
+    print(f"\ndone in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    rows = sorted(summaries.values(), key=lambda s: s["capture_rate"], reverse=True)
+    for row in rows:
+        escape = f"{row['mean_escape_time']:.2f}s" if row["mean_escape_time"] is not None else "-"
+        print(f"{row['capture_rate']:6.1%}  escape {escape:>7}  n={row['episodes']:<5} {row['params']}")
+
+    if args.summary:
+        names = sorted(sweep)
+        with open(args.summary, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(names + ["episodes", "capture_rate", "mean_escape_time", "median_escape_time"])
+            for row in rows:
+                writer.writerow([row["params"][n] for n in names] + [row["episodes"], row["capture_rate"],
+                                row["mean_escape_time"], row["median_escape_time"]])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import time
+
+import pygame
+
+class AssetCache:
+    """ Process-wide cache: every image, sound and font is read from disk once, on first use,
+    and shared by everything that asks for it again (restarts, every monster, ...) """
+
+    def __init__(self):
+        self.images = {}  # (path, size) -> Surface
+        self.sounds = {}  # path -> Sound, or None if it could not be loaded
+        self.fonts = {}   # (name, size) -> Font
+        self.loads = 0  # files actually loaded
+        self.load_time = 0.0  # seconds spent loading them
+
+    def image(self, path, size=None, fallback=(255, 0, 255), fallback_size=None):
+        """ Image converted for the display and scaled to size (w, h); a filled square if it is missing """
+        key = (path, size)
+        image = self.images.get(key)
+        if image is not None:
+            return image
+        if size is not None and (path, None) in self.images:
+            image = pygame.transform.scale(self.images[(path, None)], size)
+        else:
+            start = time.perf_counter()
+            try:
+                image = pygame.image.load(path).convert_alpha()
+                if size is not None:
+                    image = pygame.transform.scale(image, size)
+            except (pygame.error, OSError):
+                # Fallback if image missing (magenta = missing asset unless the caller picks a colour)
+                image = pygame.Surface(fallback_size or size or (50, 50))
+                image.fill(fallback)
+            self.loads += 1
+            self.load_time += time.perf_counter() - start
+        self.images[key] = image
+        return image
+
+    def init_mixer(self):
+        """ Start the mixer the first time sound is needed; False if there is no audio device """
+        if not pygame.mixer.get_init():
+            try:
+                pygame.mixer.init()
+            except pygame.error:
+                return False
+        return True
+
+    def sound(self, path):
+        if path in self.sounds:
+            return self.sounds[path]
+        sound = None
+        if path and self.init_mixer():
+            start = time.perf_counter()
+            try:
+                sound = pygame.mixer.Sound(path)
+            except (pygame.error, OSError):
+                sound = None
+            self.loads += 1
+            self.load_time += time.perf_counter() - start
+        self.sounds[path] = sound
+        return sound
+
+    def font(self, name, size):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            start = time.perf_counter()
+            font = self.fonts[key] = pygame.font.SysFont(name, size)
+            self.loads += 1
+            self.load_time += time.perf_counter() - start
+        return font
+
+    def clear(self):
+        self.images.clear()
+        self.sounds.clear()
+        self.fonts.clear()
+
+
+assets = AssetCache()
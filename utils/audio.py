@@ -0,0 +1,74 @@
+import math
+import os
+import time
+
+import pygame
+
+from utils.assets import assets
+
+class SoundManager:
+    """ Sound effects decoded once into Sound buffers and played on a fixed pool of channels.
+
+    Clips are decoded by preload() (call it off the gameplay path, e.g. on the loading screen)
+    and played only from game events, never per frame. A clip retriggered within min_interval
+    seconds is ignored, and when every channel is busy the one started longest ago is reused.
+    Without an audio device everything is a silent no-op.
+    """
+
+    def __init__(self, clips, channels=8, min_interval=0.3):
+        self.clips = clips  # name -> path (None or a missing file plays nothing)
+        self.num_channels = channels
+        self.min_interval = min_interval
+        self.sounds = {}  # name -> Sound or None
+        self.channels = []
+        self.started = []  # when each channel last started a clip, to steal the oldest
+        self.last_played = {}  # name -> time of the last play
+        self.ready = False
+
+    def preload(self):
+        if self.ready:
+            return
+        self.ready = True
+        if not assets.init_mixer():
+            return
+        pygame.mixer.set_num_channels(self.num_channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(self.num_channels)]
+        self.started = [0.0] * self.num_channels
+        for name, path in self.clips.items():
+            self.sounds[name] = assets.sound(path) if path and os.path.exists(path) else None
+
+    def play(self, name, volume=1.0):
+        sound = self.sounds.get(name)
+        if sound is None or not self.channels:
+            return None
+        now = time.perf_counter()
+        if now - self.last_played.get(name, -math.inf) < self.min_interval:
+            return None
+        self.last_played[name] = now
+
+        index = next((i for i, c in enumerate(self.channels) if not c.get_busy()), None)
+        if index is None:
+            # All busy: steal the channel whose clip started longest ago
+            index = min(range(len(self.channels)), key=self.started.__getitem__)
+        self.started[index] = now
+        channel = self.channels[index]
+        channel.set_volume(max(0.0, min(1.0, volume)))
+        channel.play(sound)
+        return channel
+
+    def play_music(self, path, loops=-1):
+        """ Stream background music if the file exists """
+        if path and os.path.exists(path) and assets.init_mixer():
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.play(loops)
+
+    def stop_music(self):
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop()
+
+
+def distance_volume(distance, max_distance=30, floor=0.15):
+    """ Louder the closer the source: 1.0 next to the player down to floor at max_distance """
+    if distance is None or distance < 0 or distance == math.inf:
+        return floor
+    return max(floor, 1.0 - distance / max_distance)
@@ -0,0 +1,193 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # draw benchmarks render off-screen
+
+import platform
+import random
+import statistics
+import time
+
+import pygame
+
+from utils.maze_generator import Maze
+from utils.monster import Monster, MonsterGroup
+from utils.flow_field import DistanceField, field_radius
+from utils.camera import Camera
+from utils.assets import assets
+
+DEFAULT_SIZES = (31, 101, 301, 1001)
+CELL_SIZE = 20  # same as the game, for the draw benchmarks
+VIEW = (100, 50, 600, 600)  # Game.maze_rect
+
+
+class Fixtures:
+    """ Mazes and worst-case pairs shared by every benchmark of one (size, seed, backend),
+    so a 1001x1001 maze is generated once rather than per benchmark """
+
+    def __init__(self, seed, backend):
+        self.seed = seed
+        self.backend = backend
+        self.mazes = {}
+        self.pairs = {}
+
+    def maze(self, size):
+        if size not in self.mazes:
+            maze = Maze(size, size, 1, seed=self.seed, backend=self.backend)
+            maze.generate_maze()
+            self.mazes[size] = maze
+        return self.mazes[size]
+
+    def worst_pair(self, size):
+        """ Two cells about a maze diameter apart (double BFS sweep), the longest searches there are """
+        if size not in self.pairs:
+            maze = self.maze(size)
+            field = DistanceField(maze)
+            field.compute((1, 1))
+            a = farthest(field)
+            field.compute(a)
+            self.pairs[size] = (a, farthest(field))
+        return self.pairs[size]
+
+def farthest(field):
+    i = max(range(len(field.dist)), key=field.dist.__getitem__)
+    return (i % field.cols, i // field.cols)
+
+def open_cells(maze):
+    return [(i % maze.cols, i // maze.cols) for i in range(len(maze.cells)) if maze.cells[i] == 0]
+
+
+# ------------------ Benchmarks: each returns seconds for one run (setup excluded) ------------------
+
+def bench_generate_maze(fx, size):
+    maze = Maze(size, size, 1, seed=fx.seed, backend=fx.backend)
+    start = time.perf_counter()
+    maze.generate_maze()
+    return time.perf_counter() - start
+
+def bench_add_multiple_paths(fx, size):
+    maze = Maze(size, size, 1, seed=fx.seed, backend=fx.backend)
+    if fx.backend == "numpy":
+        maze.generate_maze_numpy()
+    else:
+        maze.generate_maze_prim()
+    start = time.perf_counter()
+    maze.add_multiple_paths(15)
+    return time.perf_counter() - start
+
+def bench_bfs_path(fx, size):
+    maze = fx.maze(size)
+    a, b = fx.worst_pair(size)
+    monster = Monster(a[0], a[1], 1, image_path=None)
+    start = time.perf_counter()
+    monster.bfs_path(maze, a, b)
+    return time.perf_counter() - start
+
+def chase_ticks(fx, size, ticks, warmup, step):
+    """ Steady-state chase: the player random-walks (seeded), step(player_pos) advances one tick """
+    maze = fx.maze(size)
+    rng = random.Random(fx.seed)
+    player = fx.worst_pair(size)[1]
+    elapsed = 0.0
+    for tick in range(warmup + ticks):
+        if tick % 10 == 0:
+            x, y = player
+            moves = [(x + dx, y + dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)) if maze.is_open(x + dx, y + dy)]
+            player = rng.choice(moves) if moves else player
+        start = time.perf_counter()
+        step(player)
+        if tick >= warmup:
+            elapsed += time.perf_counter() - start
+    return elapsed / ticks
+
+def bench_monster_update(fx, size, ticks=600, warmup=60):
+    """ One Monster (incremental path planner), per tick """
+    maze = fx.maze(size)
+    a = fx.worst_pair(size)[0]
+    monster = Monster(a[0], a[1], 1, image_path=None)
+    return chase_ticks(fx, size, ticks, warmup, lambda player: monster.update(maze, player, 1 / 60))
+
+def bench_monster_group_update(fx, size, ticks=600, warmup=60, count=10):
+    """ Ten monsters on the shared distance field as in the game, per tick """
+    maze = fx.maze(size)
+    group = MonsterGroup(maze, 1, image_path=None)
+    rng = random.Random(fx.seed)
+    for x, y in rng.sample(open_cells(maze), count):
+        group.add(x, y)
+    field = DistanceField(maze, field_radius(maze))
+
+    def step(player):
+        field.update(player, group.replan_distance)
+        group.update(player, 1 / 60, field)
+    return chase_ticks(fx, size, ticks, warmup, step)
+
+def draw_setup(fx, size):
+    if not pygame.display.get_init():
+        pygame.display.init()
+    screen = pygame.display.get_surface() or pygame.display.set_mode((800, 700))
+    maze = Maze(size, size, CELL_SIZE, seed=fx.seed)
+    maze.cells[:] = fx.maze(size).cells  # same layout, drawn at game scale
+    maze.invalidate()
+    tile = assets.image('assets/tiles/tiles_1.png', (CELL_SIZE, CELL_SIZE))
+    camera = Camera(pygame.Rect(VIEW), CELL_SIZE, (size, size))
+    return screen, maze, tile, camera
+
+def bench_draw_cold(fx, size):
+    """ First frame: every visible chunk surface is rendered """
+    screen, maze, tile, camera = draw_setup(fx, size)
+    camera.follow(1, 1)
+    start = time.perf_counter()
+    maze.draw(screen, tile, camera.view_rect, camera)
+    return time.perf_counter() - start
+
+def bench_draw_frame(fx, size, frames=240):
+    """ Camera scrolling one cell per frame from the start diagonally, per frame """
+    screen, maze, tile, camera = draw_setup(fx, size)
+    camera.follow(1, 1)
+    maze.draw(screen, tile, camera.view_rect, camera)
+    start = time.perf_counter()
+    for frame in range(frames):
+        camera.follow(1 + frame % size, 1 + frame % size)
+        maze.draw(screen, tile, camera.view_rect, camera)
+    return (time.perf_counter() - start) / frames
+
+BENCHMARKS = {
+    "generate_maze": bench_generate_maze,
+    "add_multiple_paths": bench_add_multiple_paths,
+    "bfs_path": bench_bfs_path,
+    "monster_update": bench_monster_update,
+    "monster_group_update": bench_monster_group_update,
+    "draw_cold": bench_draw_cold,
+    "draw_frame": bench_draw_frame,
+}
+
+
+# ------------------ Running and comparing ------------------
+
+def run_benchmarks(sizes=DEFAULT_SIZES, seed=0, repeat=3, backend="prim", names=None, progress=None):
+    """ {"meta": {...}, "results": {"name/size": {"median", "min", "runs"}}}, times in seconds """
+    fx = Fixtures(seed, backend)
+    results = {}
+    for size in sizes:
+        for name in names or BENCHMARKS:
+            runs = [BENCHMARKS[name](fx, size) for _ in range(repeat)]
+            results[f"{name}/{size}"] = {"median": statistics.median(runs), "min": min(runs), "runs": runs}
+            if progress:
+                progress(f"{name}/{size}", results[f"{name}/{size}"])
+    meta = {
+        "seed": seed, "sizes": list(sizes), "repeat": repeat, "backend": backend,
+        "python": platform.python_version(), "pygame": pygame.version.ver,
+        "platform": platform.platform(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    return {"meta": meta, "results": results}
+
+def compare(current, baseline, threshold=0.10):
+    """ Rows (name, baseline median, current median, ratio, status) for benchmarks in both runs.
+    status is "slower"/"faster" when the median moved by more than threshold, else "same" """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or not base["median"]:
+            continue
+        ratio = result["median"] / base["median"]
+        status = "slower" if ratio > 1 + threshold else "faster" if ratio < 1 - threshold else "same"
+        rows.append((name, base["median"], result["median"], ratio, status))
+    return rows
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+
+import pygame
+
+class Camera:
+    """ Scrolling view onto the maze that keeps the player centred.
+
+    view_rect is where the maze appears on screen. (x, y) is the world pixel shown at its
+    top-left. world_size is (cols, rows), or None for the endless maze.
+    """
+
+    def __init__(self, view_rect, cell_size, world_size=None):
+        self.view_rect = pygame.Rect(view_rect)
+        self.cell_size = cell_size
+        self.world_size = world_size
+        self.x = 0
+        self.y = 0
+
+    def follow(self, cell_x, cell_y):
+        size = self.cell_size
+        self.x = cell_x * size + size // 2 - self.view_rect.width // 2
+        self.y = cell_y * size + size // 2 - self.view_rect.height // 2
+        if self.world_size is not None:
+            # Never scroll past the maze edges; a maze narrower than the view stays put
+            world_w, world_h = self.world_size[0] * size, self.world_size[1] * size
+            self.x = max(0, min(self.x, world_w - self.view_rect.width))
+            self.y = max(0, min(self.y, world_h - self.view_rect.height))
+
+    def world_rect(self):
+        """ Rect whose topleft is world cell (0, 0) on screen, for the existing draw(screen, maze_rect) calls """
+        return self.view_rect.move(-self.x, -self.y)
+
+    def visible_cells(self):
+        """ (x0, y0, x1, y1): cells in [x0, x1) x [y0, y1) touch the view """
+        size = self.cell_size
+        x0, y0 = self.x // size, self.y // size
+        x1 = (self.x + self.view_rect.width + size - 1) // size
+        y1 = (self.y + self.view_rect.height + size - 1) // size
+        return x0, y0, x1, y1
+
+    def is_visible(self, cell_x, cell_y, margin=1):
+        """ Culling test for entities; margin covers sprites still sliding between cells """
+        x0, y0, x1, y1 = self.visible_cells()
+        return x0 - margin <= cell_x < x1 + margin and y0 - margin <= cell_y < y1 + margin
+
+
+class ChunkSurfaceCache:
+    """ LRU of pre-rendered square chunks of tiles, so drawing cost follows the screen size.
+
+    With max_surfaces=None the cap is sized from the camera on first draw (see view_capacity).
+    """
+
+    def __init__(self, render_chunk, chunk_cells=32, max_surfaces=None):
+        self.render_chunk = render_chunk  # (chunk_x, chunk_y) -> Surface
+        self.chunk_cells = chunk_cells
+        self.max_surfaces = max_surfaces
+        self.surfaces = OrderedDict()
+
+    def view_capacity(self, camera):
+        """ Chunks the view can overlap at any scroll offset, plus one ring around them so
+        turning back after a step does not re-render what just left the screen """
+        chunk_px = self.chunk_cells * camera.cell_size
+        across = -(-camera.view_rect.width // chunk_px) + 1
+        down = -(-camera.view_rect.height // chunk_px) + 1
+        return (across + 2) * (down + 2)
+
+    def get(self, key):
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.render_chunk(*key)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_surfaces:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def discard_cells(self, cells):
+        n = self.chunk_cells
+        for x, y in cells:
+            self.surfaces.pop((x // n, y // n), None)
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def draw(self, screen, camera):
+        """ Blit only the chunks that overlap the camera view (and the current clip, so a
+        dirty rect can be repainted by clipping to it first) """
+        if self.max_surfaces is None:
+            self.max_surfaces = self.view_capacity(camera)
+        n = self.chunk_cells
+        chunk_px = n * camera.cell_size
+        x0, y0, x1, y1 = camera.visible_cells()
+        clip = screen.get_clip()
+        screen.set_clip(camera.view_rect.clip(clip))
+        for cy in range(y0 // n, (y1 - 1) // n + 1):
+            for cx in range(x0 // n, (x1 - 1) // n + 1):
+                screen.blit(self.get((cx, cy)), (camera.view_rect.x + cx * chunk_px - camera.x,
+                                                 camera.view_rect.y + cy * chunk_px - camera.y))
+        screen.set_clip(clip)
@@ -0,0 +1,130 @@
+import random
+from collections import OrderedDict
+
+import pygame
+
+from utils.maze_generator import WallFrontier
+from utils.camera import ChunkSurfaceCache
+
+class ChunkedMaze:
+    """ Endless maze generated in fixed-size chunks around the player.
+
+    World cells are unbounded integer coordinates. Rooms sit on odd coordinates as in Maze.
+    Chunk (cx, cy) covers cells [cx*S, cx*S+S) x [cy*S, cy*S+S) and owns the seam wall
+    column/row at local x = 0 / y = 0, so every seam cell belongs to exactly one chunk and
+    both sides always agree on where the openings are. Chunks are generated from
+    (seed, cx, cy) alone, so an evicted chunk can simply be generated again.
+    """
+
+    def __init__(self, cell_size, seed=None, chunk_size=16, max_chunks=64, seam_openings=2, loops=2):
+        if chunk_size % 2:
+            raise ValueError("chunk_size must be even so rooms stay on odd coordinates")
+        self.cell_size = cell_size
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks  # memory bound: max_chunks * chunk_size**2 bytes
+        self.seam_openings = seam_openings
+        self.loops = loops
+        self.chunks = OrderedDict()  # (cx, cy) -> bytearray (1 = wall), least recently used first
+        self.version = 0  # a chunk regenerates identically after eviction, so this never changes
+        self.search_limit = 4 * chunk_size * chunk_size  # keep searches finite in an endless world
+        self.generated = 0
+        self.evicted = 0
+        self.surface_cache = None
+        self.surface_tile = None
+
+    # ------------------ Cell access ------------------
+
+    def chunk(self, cx, cy):
+        key = (cx, cy)
+        cells = self.chunks.get(key)
+        if cells is None:
+            cells = self.generate_chunk(cx, cy)
+            self.chunks[key] = cells
+            self.generated += 1
+            while len(self.chunks) > self.max_chunks:
+                self.chunks.popitem(last=False)  # least recently used
+                self.evicted += 1
+        else:
+            self.chunks.move_to_end(key)
+        return cells
+
+    def is_open(self, x, y):
+        s = self.chunk_size
+        cells = self.chunk(x // s, y // s)
+        return cells[(y % s) * s + (x % s)] == 0
+
+    def prefetch(self, x, y, radius=1):
+        """ Make sure the chunks within radius chunks of cell (x, y) exist """
+        s = self.chunk_size
+        cx, cy = x // s, y // s
+        for dy in range(-radius, radius + 1):
+            for dx in range(-radius, radius + 1):
+                self.chunk(cx + dx, cy + dy)
+
+    # ------------------ Generation ------------------
+
+    def generate_chunk(self, cx, cy):
+        """ Prim's maze over the chunk's rooms plus seeded openings in its two seams """
+        s = self.chunk_size
+        rng = random.Random(f"{self.seed}:{cx}:{cy}")
+        cells = bytearray(b"\x01") * (s * s)
+
+        # Same frontier-based Prim's as Maze.generate_maze, restricted to this chunk
+        visited = bytearray(s * s)
+        walls = WallFrontier()
+        cells[1 * s + 1] = 0
+        visited[1 * s + 1] = 1
+        for wall in self._inner_walls(1, 1):
+            walls.add(wall)
+        while walls:
+            wx, wy = walls.choice(rng)
+            (ax, ay), (bx, by) = ((wx - 1, wy), (wx + 1, wy)) if wx % 2 == 0 else ((wx, wy - 1), (wx, wy + 1))
+            a_visited = visited[ay * s + ax]
+            if a_visited + visited[by * s + bx] == 1:
+                nx, ny = (bx, by) if a_visited else (ax, ay)
+                cells[wy * s + wx] = 0
+                cells[ny * s + nx] = 0
+                visited[ny * s + nx] = 1
+                for wall in self._inner_walls(nx, ny):
+                    walls.add(wall)
+            walls.remove((wx, wy))
+
+        # A few loops so a chunk is not a perfect maze (like add_multiple_paths)
+        inner_walls = [(x, y) for y in range(1, s) for x in range(1, s) if (x + y) % 2 == 1]
+        for x, y in rng.sample(inner_walls, min(len(inner_walls), self.loops)):
+            cells[y * s + x] = 0
+
+        # Seams: rooms at odd local coordinates, openings picked from the seed and chunk id
+        rooms = list(range(1, s, 2))
+        for y in rng.sample(rooms, self.seam_openings):
+            cells[y * s + 0] = 0  # left seam, joins chunk (cx - 1, cy)
+        for x in rng.sample(rooms, self.seam_openings):
+            cells[0 * s + x] = 0  # top seam, joins chunk (cx, cy - 1)
+        return cells
+
+    def _inner_walls(self, x, y):
+        """ Walls between room (x, y) and its neighbouring rooms inside this chunk """
+        s = self.chunk_size
+        return [(x + dx, y + dy) for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                if 0 < x + 2 * dx < s and 0 < y + 2 * dy < s]
+
+    # ------------------ Drawing ------------------
+
+    def draw(self, screen, tile_img, maze_rect, camera):
+        """ Draw the chunks the camera sees; their surfaces are cached since chunks never change """
+        if self.surface_cache is None or self.surface_tile is not tile_img:
+            self.surface_cache = ChunkSurfaceCache(lambda cx, cy: self.render_chunk(tile_img, cx, cy),
+                                                   chunk_cells=self.chunk_size, max_surfaces=self.max_chunks)
+            self.surface_tile = tile_img
+        self.surface_cache.draw(screen, camera)
+
+    def render_chunk(self, tile_img, cx, cy):
+        s, size = self.chunk_size, self.cell_size
+        cells = self.chunk(cx, cy)
+        surface = pygame.Surface((s * size, s * size))
+        surface.fill((30, 30, 30))  # Path (dark gray)
+        for i, wall in enumerate(cells):
+            if wall:
+                surface.blit(tile_img, ((i % s) * size, (i // s) * size))
+        return surface
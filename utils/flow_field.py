@@ -0,0 +1,268 @@
+from array import array
+
+UNREACHABLE = -1
+# Mazes with more cells than this get a bounded field: a full-grid BFS costs about 0.7 us per
+# open cell, i.e. a ~300 ms stall on every player step at 1001x1001
+LARGE_MAZE_CELLS = 101 * 101
+LARGE_MAZE_RADIUS = 120  # cells; well past the window (30 cells across) and the FSM thresholds
+
+def field_radius(maze):
+    """ max_distance the game uses for the shared field of this maze (None = whole maze) """
+    return LARGE_MAZE_RADIUS if maze.cols * maze.rows > LARGE_MAZE_CELLS else None
+
+def expand_ring(walls, cols, dist, frontier, d):
+    """ One BFS ring: mark the unvisited open neighbours of frontier with d and return them.
+    Reads walls directly, so huge grids need no neighbour table """
+    n = len(walls)
+    next_frontier = []
+    append = next_frontier.append
+    for i in frontier:
+        x = i % cols
+        if x > 0 and not walls[i - 1] and dist[i - 1] < 0:
+            dist[i - 1] = d
+            append(i - 1)
+        if x < cols - 1 and not walls[i + 1] and dist[i + 1] < 0:
+            dist[i + 1] = d
+            append(i + 1)
+        if i >= cols and not walls[i - cols] and dist[i - cols] < 0:
+            dist[i - cols] = d
+            append(i - cols)
+        if i + cols < n and not walls[i + cols] and dist[i + cols] < 0:
+            dist[i + cols] = d
+            append(i + cols)
+    return next_frontier
+
+class DistanceField:
+    """ BFS distance from the player's cell to every cell, shared by all monsters.
+
+    With max_distance the search stops that many steps out and only the cells it reached are
+    reset next time, so a recompute costs the neighbourhood rather than the whole grid; cells
+    further away read as UNREACHABLE here and are covered by `far` (see FarField) instead.
+    """
+
+    def __init__(self, maze, max_distance=None):
+        self.maze = maze
+        self.cols = maze.cols
+        self.rows = maze.rows
+        self.max_distance = max_distance
+        self.dist = array('i', [UNREACHABLE]) * (self.cols * self.rows)  # flat, index y * cols + x
+        self.touched = []  # cells the last bounded search wrote, reset by the next one
+        self.far = FarField(maze) if max_distance is not None else None  # whole maze, beyond max_distance
+        self.source = None
+        self.maze_version = None
+        self.neighbors = None
+        self.neighbors_version = None
+        self.nodes_expanded = 0  # cells popped by the last recompute
+        self.computes = 0  # BFS runs so far, and cells they expanded in total (for profiling)
+        self.expanded_total = 0
+
+    def update(self, source, tolerance=0):
+        """ Recompute only if the player moved more than tolerance cells or the maze changed """
+        if self.far is not None:
+            self.far.update(source)  # a slice of its search every tick
+        if (self.source is not None and self.maze_version == self.maze.version
+                and abs(source[0] - self.source[0]) + abs(source[1] - self.source[1]) <= tolerance):
+            return False
+        self.compute(source)
+        return True
+
+    def load(self, source, dist):
+        """ Adopt distances computed earlier (e.g. stored in a maze file) instead of running BFS """
+        self.dist = array('i', dist)
+        self.touched = None  # unknown: the next bounded search starts from a clean array
+        self.source = source
+        self.maze_version = self.maze.version
+
+    def build_neighbors(self):
+        """ Open neighbours of every open cell as flat indices, rebuilt only when the maze changes """
+        cols, rows = self.cols, self.rows
+        walls = self.maze.cells  # flat, shared with the maze (no copy)
+        neighbors = [()] * (cols * rows)
+        for i in range(cols * rows):
+            if walls[i]:
+                continue
+            x = i % cols
+            cells = []
+            if x > 0 and not walls[i - 1]: cells.append(i - 1)
+            if x < cols - 1 and not walls[i + 1]: cells.append(i + 1)
+            if i >= cols and not walls[i - cols]: cells.append(i - cols)
+            if i + cols < cols * rows and not walls[i + cols]: cells.append(i + cols)
+            neighbors[i] = tuple(cells)
+        self.neighbors = neighbors
+        self.neighbors_version = self.maze.version
+
+    def compute(self, source):
+        if self.max_distance is not None:
+            self.compute_bounded(source, self.max_distance)
+            return
+        cols, rows = self.cols, self.rows
+        if self.neighbors_version != self.maze.version:
+            self.build_neighbors()
+        neighbors = self.neighbors
+
+        dist = array('i', [UNREACHABLE]) * (cols * rows)
+        sx, sy = source
+        expanded = 0
+        if 0 <= sx < cols and 0 <= sy < rows and not self.maze.cells[sy * cols + sx]:
+            start = sy * cols + sx
+            dist[start] = 0
+            # BFS one ring at a time: plain lists are cheaper than a deque here
+            frontier = [start]
+            d = 0
+            while frontier:
+                d += 1
+                expanded += len(frontier)
+                next_frontier = []
+                append = next_frontier.append
+                for i in frontier:
+                    for j in neighbors[i]:
+                        if dist[j] < 0:
+                            dist[j] = d
+                            append(j)
+                frontier = next_frontier
+
+        self.dist = dist
+        self.source = source
+        self.maze_version = self.maze.version
+        self.nodes_expanded = expanded
+        self.computes += 1
+        self.expanded_total += expanded
+
+    def compute_bounded(self, source, limit):
+        """ BFS out to limit steps, reading walls directly (no neighbour table for huge grids) """
+        cols, rows = self.cols, self.rows
+        n = cols * rows
+        walls = self.maze.cells
+        if self.touched is None:
+            dist = self.dist = array('i', [UNREACHABLE]) * n
+        else:
+            dist = self.dist
+            for i in self.touched:
+                dist[i] = UNREACHABLE
+        touched = []
+        sx, sy = source
+        expanded = 0
+        if 0 <= sx < cols and 0 <= sy < rows and not walls[sy * cols + sx]:
+            start = sy * cols + sx
+            dist[start] = 0
+            touched.append(start)
+            frontier = [start]
+            d = 0
+            while frontier and d < limit:
+                d += 1
+                expanded += len(frontier)
+                frontier = expand_ring(walls, cols, dist, frontier, d)
+                touched.extend(frontier)
+
+        self.touched = touched
+        self.source = source
+        self.maze_version = self.maze.version
+        self.nodes_expanded = expanded
+        self.computes += 1
+        self.expanded_total += expanded
+
+    def distance(self, pos):
+        """ Path length in cells to the player, or UNREACHABLE """
+        x, y = pos
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return self.dist[y * self.cols + x]
+        return UNREACHABLE
+
+    def next_step(self, pos):
+        """ Neighbouring cell one step closer to the player (None if there or unreachable) """
+        x, y = pos
+        cols = self.cols
+        d = self.distance(pos)
+        if d <= 0:
+            return None
+        dist = self.dist
+        i = y * cols + x
+        if x > 0 and dist[i - 1] == d - 1:
+            return (x - 1, y)
+        if x < cols - 1 and dist[i + 1] == d - 1:
+            return (x + 1, y)
+        if y > 0 and dist[i - cols] == d - 1:
+            return (x, y - 1)
+        if y < self.rows - 1 and dist[i + cols] == d - 1:
+            return (x, y + 1)
+        return None
+
+
+class FarField(DistanceField):
+    """ Whole-maze distances for monsters beyond a bounded DistanceField, with the BFS spread
+    over ticks. Each update() expands whole rings until about `budget` cells, while dist keeps
+    the last finished search. A new search starts once the player is more than `tolerance`
+    cells from the source of the finished one, so far-away monsters head for where the player
+    was a few seconds ago (they are idle-slow that far out anyway).
+    """
+
+    def __init__(self, maze, budget=4096, tolerance=32):
+        super().__init__(maze)
+        self.budget = budget
+        self.tolerance = tolerance
+        self.pending = None  # search in progress: [source, dist, frontier, rings expanded]
+
+    def update(self, source, tolerance=None):
+        if self.source is None:
+            self.compute(source)  # nothing to fall back on: the first search runs in one go
+            return True
+        if self.pending is not None and self.maze_version != self.maze.version:
+            self.pending = None  # grid edited mid-search: start over
+        if self.pending is None:
+            if (self.maze_version == self.maze.version
+                    and abs(source[0] - self.source[0]) + abs(source[1] - self.source[1]) <= self.tolerance):
+                return False
+            self.start(source)
+        return self.advance(self.budget)
+
+    def compute(self, source):
+        self.start(source)
+        self.advance(None)
+
+    def start(self, source):
+        cols, rows = self.cols, self.rows
+        dist = array('i', [UNREACHABLE]) * (cols * rows)
+        sx, sy = source
+        frontier = []
+        if 0 <= sx < cols and 0 <= sy < rows and not self.maze.cells[sy * cols + sx]:
+            dist[sy * cols + sx] = 0
+            frontier.append(sy * cols + sx)
+        self.pending = [source, dist, frontier, 0]
+        self.maze_version = self.maze.version
+
+    def advance(self, budget, rings=None):
+        """ Expand rings until budget cells (None = no limit) or `rings` rings in total have
+        been expanded; returns True when the search finished and dist was swapped in """
+        pending = self.pending
+        source, dist, frontier, done = pending
+        walls, cols = self.maze.cells, self.cols
+        expanded = 0
+        while frontier and (budget is None or expanded < budget) and (rings is None or done < rings):
+            expanded += len(frontier)
+            done += 1
+            frontier = expand_ring(walls, cols, dist, frontier, done)
+        pending[2], pending[3] = frontier, done
+        self.nodes_expanded = expanded
+        self.expanded_total += expanded
+        if frontier:
+            return False
+        self.pending = None
+        self.dist = dist
+        self.source = source
+        self.computes += 1
+        return True
+
+    def state(self):
+        """ (finished source, pending source, rings) - enough to rebuild this field exactly """
+        if self.pending is None:
+            return self.source, None, 0
+        return self.source, self.pending[0], self.pending[3]
+
+    def restore(self, source, pending, rings):
+        self.pending = None
+        self.source = None
+        if source is not None:
+            self.compute(source)
+        if pending is not None:
+            self.start(pending)
+            self.advance(None, rings)
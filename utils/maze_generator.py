@@ -1,85 +1,324 @@
 import random
 import pygame
 
+try:
+    import numpy
+except ImportError:  # optional, only for as_numpy() and the "numpy" backend
+    numpy = None
+
+from utils.maze_graph import CorridorGraph
+from utils.perception import VisibilityIndex
+from utils.camera import ChunkSurfaceCache
+
+BACKENDS = ("prim", "numpy")
+AVAILABLE_BACKENDS = tuple(name for name in BACKENDS if name != "numpy" or numpy is not None)
+
+def check_backend(backend):
+    """ Raise early (ValueError / ImportError) for a backend that cannot run here """
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown maze backend {backend!r}, expected one of {BACKENDS}")
+    if backend not in AVAILABLE_BACKENDS:
+        raise ImportError(f"numpy is required for the {backend} maze backend")
+
 class Maze:
-    def __init__(self, cols, rows, cell_size):
+    def __init__(self, cols, rows, cell_size, seed=None, backend="prim"):
+        check_backend(backend)
+        self.backend = backend  # "prim": per-cell Python loop, "numpy": vectorised Kruskal
         self.cols = cols
         self.rows = rows
         self.cell_size = cell_size
-        self.grid = [[1 for _ in range(cols)] for _ in range(rows)]  # Start with all walls
-        # print(len(self.grid))
+        # Every maze owns its RNG so the same seed always gives the same maze
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        self.np_rng = numpy.random.default_rng(self.seed) if backend == "numpy" else None
+        self.progress = 0.0  # fraction of cells carved, read by the loading screen
+        # One byte per cell, flat index y * cols + x (1 = wall). Start with all walls
+        self.cells = bytearray(b"\x01") * (cols * rows)
+        # grid[y][x] still works: each row is a zero-copy memoryview into self.cells
+        view = memoryview(self.cells)
+        self.grid = [view[y * cols:(y + 1) * cols] for y in range(rows)]
+        self.surface = None  # pre-rendered maze, rebuilt only after grid changes
+        self.surface_tile = None
+        self.chunk_cache = None  # per-chunk surfaces for camera drawing of big mazes
+        self.version = 0  # bumped on every grid change so caches know to rebuild
+        self.graph = None  # corridor graph, built on first corridor_graph() call
+        self.sight = None  # line-of-sight index, built on first visibility() call
+        self.search_limit = None  # finite maze: searches may cover every cell
 
-    # Prims Algorithm to generate a maze (then we added the multi path logic)
     def generate_maze(self):
+        if self.backend == "numpy":
+            self.generate_maze_numpy()
+        else:
+            self.generate_maze_prim()
+        self.add_multiple_paths(15)
+        self.progress = 1.0
+
+    # Prims Algorithm to generate a maze (then we added the multi path logic)
+    def generate_maze_prim(self):
+        cols = self.cols
+        cells = self.cells
+        rng = self.rng
+        total_cells = max(1, ((self.cols - 1) // 2) * ((self.rows - 1) // 2))
+        carved = 1
+        self.progress = 0.0
         
         # 1. start with the grid full of walls
-        visited = set()
-        wall_list = []
+        visited = bytearray(self.cols * self.rows)  # 1 byte per cell, indexed y * cols + x
+        wall_list = WallFrontier()
         
         # Start cell in odd coordinates to avoid edge
         start_x, start_y = 1, 1
-        self.grid[start_y][start_x] = 0
+        cells[start_y * cols + start_x] = 0
         
         # 2. Choose the random cell to start with, here we chose first cell 
-        visited.add((start_x, start_y))
+        visited[start_y * cols + start_x] = 1
 
         # Add surrounding walls
-        wall_list.extend(self.get_neighbors(start_x, start_y, is_wall=True))
+        for wall in self.get_neighbors(start_x, start_y, is_wall=True):
+            wall_list.add(wall)
 
         while wall_list: 
-            wx, wy = random.choice(wall_list)
+            wx, wy = wall_list.choice(rng)
 
             # 3. Get cells on either side of the wall
             neighbors = self.get_adjacent_cells(wx, wy)
             if len(neighbors) == 2:
                 c1, c2 = neighbors
-                visited_count = sum([c in visited for c in neighbors])
+                c1_visited = visited[c1[1] * cols + c1[0]]
+                visited_count = c1_visited + visited[c2[1] * cols + c2[0]]
 
                 if visited_count == 1:
                     # Make wall a passage
-                    self.grid[wy][wx] = 0
+                    cells[wy * cols + wx] = 0
 
                     # Mark unvisited cell
-                    next_cell = c1 if c1 not in visited else c2
-                    nx, ny = next_cell
-                    visited.add(next_cell)
-                    self.grid[ny][nx] = 0
+                    nx, ny = c2 if c1_visited else c1
+                    visited[ny * cols + nx] = 1
+                    cells[ny * cols + nx] = 0
+                    carved += 1
+                    self.progress = carved / total_cells
 
-                    # Add new walls
+                    # Add new walls (already queued walls are ignored)
                     for wall in self.get_neighbors(nx, ny, is_wall=True):
-                        if wall not in wall_list:
-                            wall_list.append(wall)
+                        wall_list.add(wall)
             wall_list.remove((wx, wy))
-        self.add_multiple_paths(15)
-        
+
+    def generate_maze_numpy(self):
+        """ Randomised Kruskal's over whole arrays.
+
+        Kruskal's with a random wall order builds the minimum spanning tree of the rooms for
+        random wall weights, so instead of merging one wall at a time we run Boruvka rounds:
+        every component opens its lightest wall to another component, then the component
+        labels are merged by pointer jumping. Each round at least halves the number of
+        components, so there are O(log n) rounds of vectorised work.
+        """
+        rng = self.np_rng
+        room_cols, room_rows = self.cols // 2, self.rows // 2  # rooms sit on odd coordinates
+        n = room_cols * room_rows
+        self.progress = 0.0
+
+        # Walls between neighbouring rooms as (u, v) room ids; position in the shuffled order is the weight
+        ids = numpy.arange(n).reshape(room_rows, room_cols)
+        u = numpy.concatenate((ids[:, :-1].ravel(), ids[:-1, :].ravel()))
+        v = numpy.concatenate((ids[:, 1:].ravel(), ids[1:, :].ravel()))
+        order = rng.permutation(len(u))
+        u, v = u[order], v[order]
+        no_wall = len(u)
+
+        comp = numpy.arange(n)  # component label of every room
+        tree = numpy.zeros(len(u), dtype=bool)
+        live = numpy.arange(len(u))  # walls that still separate two components
+        while True:
+            cu, cv = comp[u[live]], comp[v[live]]
+            crossing = cu != cv
+            if not crossing.any():
+                break
+            live, cu, cv = live[crossing], cu[crossing], cv[crossing]
+
+            # Lightest wall leaving each component
+            best = numpy.full(n, no_wall)
+            numpy.minimum.at(best, cu, live)
+            numpy.minimum.at(best, cv, live)
+            roots = numpy.flatnonzero(best < no_wall)
+            chosen = best[roots]
+            tree[chosen] = True
+
+            # Hook each component onto the one across its wall; two components that picked
+            # the same wall point at each other, so the lower label becomes the root
+            a, b = comp[u[chosen]], comp[v[chosen]]
+            other = numpy.where(a == roots, b, a)
+            parent = numpy.arange(n)
+            parent[roots] = other
+            mutual = (parent[other] == roots) & (roots < other)
+            parent[roots[mutual]] = roots[mutual]
+            while True:
+                jumped = parent[parent]
+                if numpy.array_equal(jumped, parent):
+                    break
+                parent = jumped
+            comp = parent[comp]
+            self.progress = numpy.count_nonzero(tree) / max(1, n - 1)
+
+        # Carve rooms and opened walls; a wall's cell is midway between its two rooms
+        grid = self.as_numpy()
+        grid[1:2 * room_rows:2, 1:2 * room_cols:2] = 0
+        opened = numpy.flatnonzero(tree)
+        ur, uc = numpy.divmod(u[opened], room_cols)
+        vr, vc = numpy.divmod(v[opened], room_cols)
+        grid[ur + vr + 1, uc + vc + 1] = 0
+
     def add_multiple_paths(self, count=20):
         """ Randomly removes walls (not near start/end) to add more paths """
         margin = 4  # Distance margin from start & end
-        added = 0
-        while added < count:
-            x = random.randint(margin, self.cols - margin - 1)
-            y = random.randint(margin, self.rows - margin - 1)
+        if self.backend == "numpy":
+            opened = self.pick_loop_walls_numpy(count, margin)
+        else:
+            opened = self.pick_loop_walls(count, margin)
+        # exit            
+        self.cells[(self.rows - 2) * self.cols + self.cols - 1] = 0 
+        opened.append((self.cols - 1, self.rows - 2))
+        self.invalidate(opened)
+
+    def set_cell(self, x, y, value):
+        """ Change a single cell at runtime (1 = wall, 0 = path) """
+        if self.cells[y * self.cols + x] != value:
+            self.cells[y * self.cols + x] = value
+            self.invalidate([(x, y)])
+
+    def invalidate(self, cells=None):
+        """ Call after editing grid directly so draw() and distance fields rebuild.
+        Passing the edited cells lets the corridor graph update locally instead of rebuilding. """
+        self.surface = None
+        if self.chunk_cache is not None:
+            if cells is None:
+                self.chunk_cache.clear()
+            else:
+                self.chunk_cache.discard_cells(cells)
+        self.version += 1
+        if self.graph is not None:
+            if cells is None:
+                self.graph = None
+            else:
+                self.graph.update_cells(cells)
+        if self.sight is not None:
+            if cells is None:
+                self.sight = None
+            else:
+                self.sight.update_cells(cells)
 
-            if self.grid[y][x] == 1:
+    def pick_loop_walls(self, count, margin):
+        """ Rejection sampling; falls back to the full list of candidates when few are left """
+        opened = []
+        attempts = 0
+        while len(opened) < count:
+            if attempts >= 50 * count:
+                # Too few eligible walls to hit at random: sample the ones that are left
+                candidates = self.loop_wall_candidates(margin)
+                for x, y in self.rng.sample(candidates, min(count - len(opened), len(candidates))):
+                    self.cells[y * self.cols + x] = 0
+                    opened.append((x, y))
+                break
+            attempts += 1
+            x = self.rng.randint(margin, self.cols - margin - 1)
+            y = self.rng.randint(margin, self.rows - margin - 1)
+
+            if self.cells[y * self.cols + x] == 1:
                 # Check if it's a wall with 2 opposite paths
                 if self.has_path_on_both_sides(x, y):
-                    self.grid[y][x] = 0
-                    added += 1
-        # exit            
-        self.grid[self.rows - 2][self.cols - 1] = 0 
-        
+                    self.cells[y * self.cols + x] = 0
+                    opened.append((x, y))
+        return opened
 
-    def draw(self, screen, tile_img, maze_rect):
-        for y in range(self.rows):
-            for x in range(self.cols):
-                rect = pygame.Rect(x * self.cell_size + maze_rect.x, y * self.cell_size + maze_rect.y, self.cell_size, self.cell_size)
-                if self.grid[y][x] == 1:
-                    screen.blit(tile_img, rect)  # Wall tile
-                else:
-                    pygame.draw.rect(screen, (30,30, 30), rect)  # Path (dark gray)
+    def loop_wall_candidates(self, margin):
+        """ Walls inside the margin with a path on two opposite sides """
+        return [(x, y) for y in range(margin, self.rows - margin) for x in range(margin, self.cols - margin)
+                if self.cells[y * self.cols + x] == 1 and self.has_path_on_both_sides(x, y)]
+
+    def pick_loop_walls_numpy(self, count, margin):
+        """ Same rule as pick_loop_walls, evaluated for every wall at once and sampled without replacement """
+        grid = self.as_numpy()
+        rows, cols = self.rows, self.cols
+        inner = grid[margin:rows - margin, margin:cols - margin]
+        if inner.size == 0:
+            return []
+        horizontal = (grid[margin:rows - margin, margin - 1:cols - margin - 1] == 0) & \
+                     (grid[margin:rows - margin, margin + 1:cols - margin + 1] == 0)
+        vertical = (grid[margin - 1:rows - margin - 1, margin:cols - margin] == 0) & \
+                   (grid[margin + 1:rows - margin + 1, margin:cols - margin] == 0)
+        ys, xs = numpy.nonzero((inner == 1) & (horizontal | vertical))
+        # Opening walls never closes a path, so walls picked together all stay eligible
+        picks = self.np_rng.choice(len(xs), size=min(count, len(xs)), replace=False)
+        xs, ys = xs[picks] + margin, ys[picks] + margin
+        inner[ys - margin, xs - margin] = 0
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def corridor_graph(self):
+        """ Junction/corridor graph of the current grid (see utils/maze_graph.py) """
+        if self.graph is None:
+            self.graph = CorridorGraph(self)
+        return self.graph
+
+    def visibility(self):
+        """ Straight-line sight index of the current grid (see utils/perception.py) """
+        if self.sight is None:
+            self.sight = VisibilityIndex(self)
+        return self.sight
+
+    def draw(self, screen, tile_img, maze_rect, camera=None):
+        if camera is not None:
+            # Maze bigger than the screen: draw only the chunks the camera sees
+            if self.chunk_cache is None or self.surface_tile is not tile_img:
+                self.chunk_cache = ChunkSurfaceCache(lambda cx, cy: self.render_chunk(tile_img, cx, cy))
+                self.surface_tile = tile_img
+            self.chunk_cache.draw(screen, camera)
+            return
+        if self.surface is None or self.surface_tile is not tile_img:
+            self.surface = self.render_surface(tile_img)
+            self.surface_tile = tile_img
+        screen.blit(self.surface, maze_rect.topleft)
+
+    def render_surface(self, tile_img):
+        """ Render every cell once into an off-screen surface """
+        surface = pygame.Surface((self.cols * self.cell_size, self.rows * self.cell_size))
+        surface.fill((30, 30, 30))  # Path (dark gray)
+        cols, size = self.cols, self.cell_size
+        for i in range(len(self.cells)):
+            if self.cells[i] == 1:
+                surface.blit(tile_img, ((i % cols) * size, (i // cols) * size))  # Wall tile
+        return surface
                     
+    def render_chunk(self, tile_img, cx, cy):
+        """ Render one chunk_cache chunk (clipped to the maze edges) """
+        n = self.chunk_cache.chunk_cells
+        x0, y0 = cx * n, cy * n
+        x1, y1 = min(x0 + n, self.cols), min(y0 + n, self.rows)
+        surface = pygame.Surface((max(0, x1 - x0) * self.cell_size, max(0, y1 - y0) * self.cell_size))
+        surface.fill((30, 30, 30))  # Path (dark gray)
+        for y in range(max(y0, 0), y1):
+            row = self.grid[y]  # memoryview, no copy
+            for x in range(max(x0, 0), x1):
+                if row[x] == 1:
+                    surface.blit(tile_img, ((x - x0) * self.cell_size, (y - y0) * self.cell_size))
+        return surface
+
+    # ------------------ Grid access ------------------
+
+    def buffer(self):
+        """ Read/write memoryview over the flat cells, for sharing without copies """
+        return memoryview(self.cells)
+
+    def as_numpy(self):
+        """ (rows, cols) uint8 NumPy view of the same memory; needs numpy installed """
+        if numpy is None:
+            raise ImportError("numpy is required for Maze.as_numpy()")
+        return numpy.frombuffer(self.cells, dtype=numpy.uint8).reshape(self.rows, self.cols)
+
     # ------------------ Helpers ------------------
 
+    def is_open(self, x, y):
+        """ True for a path cell inside the maze (same question ChunkedMaze answers) """
+        return 0 <= x < self.cols and 0 <= y < self.rows and self.cells[y * self.cols + x] == 0
+
     def get_neighbors(self, x, y, is_wall=False):
         """ Returns walls or paths 2 cells away in cardinal directions """
         directions = [(-2, 0), (2, 0), (0, -2), (0, 2)]
@@ -104,9 +343,40 @@ class Maze:
 
     def has_path_on_both_sides(self, x, y):
         """ Check if wall has a path on both opposite sides """
-        if x > 0 and x < self.cols - 1 and self.grid[y][x - 1] == 0 and self.grid[y][x + 1] == 0:
+        cols, cells = self.cols, self.cells
+        i = y * cols + x
+        if x > 0 and x < cols - 1 and cells[i - 1] == 0 and cells[i + 1] == 0:
             return True
-        if y > 0 and y < self.rows - 1 and self.grid[y - 1][x] == 0 and self.grid[y + 1][x] == 0:
+        if y > 0 and y < self.rows - 1 and cells[i - cols] == 0 and cells[i + cols] == 0:
             return True
         return False
-    
\ No newline at end of file
+
+
+class WallFrontier:
+    """ Set of walls with O(1) add, remove, membership test and random pick """
+
+    def __init__(self):
+        self.items = []  # dense list so a random pick is a single index
+        self.index = {}  # wall -> position in self.items
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, wall):
+        return wall in self.index
+
+    def add(self, wall):
+        if wall not in self.index:
+            self.index[wall] = len(self.items)
+            self.items.append(wall)
+
+    def remove(self, wall):
+        """ Swap the last wall into the removed slot so nothing shifts """
+        i = self.index.pop(wall)
+        last = self.items.pop()
+        if i < len(self.items):
+            self.items[i] = last
+            self.index[last] = i
+
+    def choice(self, rng):
+        return self.items[rng.randrange(len(self.items))]
@@ -0,0 +1,255 @@
+import heapq
+from collections import deque
+
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+class CorridorGraph:
+    """ Maze compressed to junctions, dead ends, start and exit, joined by corridors.
+
+    edges[node][first] = (other, length, last): leaving `node` through its neighbour `first`
+    reaches `other` after `length` steps, entering it from `last`.
+    corridor_of[cell] = (node, first, offset) places every corridor cell on one of those edges.
+    """
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.start = (1, 1)
+        self.exit = (maze.cols - 1, maze.rows - 2)
+        self.nodes = set()
+        self.edges = {}
+        self.corridor_of = {}
+        self.nodes_expanded = 0  # graph nodes popped by the last find_path
+        self.build()
+
+    # ------------------ Building ------------------
+
+    def is_open(self, x, y):
+        return self.maze.is_open(x, y)
+
+    def open_neighbors(self, cell):
+        x, y = cell
+        return [(x + dx, y + dy) for dx, dy in DIRECTIONS if self.is_open(x + dx, y + dy)]
+
+    def is_node(self, cell):
+        if not self.is_open(*cell):
+            return False
+        return cell == self.start or cell == self.exit or len(self.open_neighbors(cell)) != 2
+
+    def build(self):
+        self.nodes = set()
+        self.edges = {}
+        self.corridor_of = {}
+        cells, cols = self.maze.cells, self.maze.cols
+        for i in range(len(cells)):
+            if cells[i] == 0 and self.is_node((i % cols, i // cols)):
+                self.nodes.add((i % cols, i // cols))
+        for node in self.nodes:
+            self.walk_all(node)
+
+    def walk_all(self, node):
+        self.edges.setdefault(node, {})
+        for first in self.open_neighbors(node):
+            self.walk(node, first)
+
+    def walk(self, node, first):
+        """ Follow the corridor from node through first until the next node, recording the edge """
+        cells = []
+        prev, cur = node, first
+        while cur not in self.nodes:
+            cells.append(cur)
+            nxt = [c for c in self.open_neighbors(cur) if c != prev]
+            if not nxt or cur == first and cells[1:]:
+                return  # loop with no node on it; never reachable from a node
+            prev, cur = cur, nxt[0]
+        length = len(cells) + 1
+        self.edges.setdefault(node, {})[first] = (cur, length, prev)
+        self.edges.setdefault(cur, {})[prev] = (node, length, first)
+        for offset, cell in enumerate(cells, 1):
+            self.corridor_of[cell] = (node, first, offset)
+
+    def update_cells(self, cells):
+        """ Rebuild only the corridors around cells that were opened or walled """
+        affected = set()
+        for x, y in cells:
+            affected.add((x, y))
+            affected.update((x + dx, y + dy) for dx, dy in DIRECTIONS)
+
+        dirty = set()
+        for cell in affected:
+            if cell in self.nodes:
+                dirty.add(cell)
+            elif cell in self.corridor_of:
+                node, first, _ = self.corridor_of[cell]
+                dirty.add(node)
+                edge = self.edges.get(node, {}).get(first)
+                if edge:
+                    dirty.add(edge[0])
+
+        for cell in affected:
+            if self.is_node(cell):
+                self.nodes.add(cell)
+                dirty.add(cell)
+            elif cell in self.nodes:
+                self.nodes.discard(cell)  # dirty already holds it
+            self.corridor_of.pop(cell, None)
+
+        # Drop every corridor touching a dirty node, then walk them again from both ends.
+        # Cells on those corridors get their corridor_of entry rewritten by the new walk.
+        ends = set()
+        for node in dirty:
+            for first, (other, length, last) in self.edges.pop(node, {}).items():
+                ends.add(other)
+                self.edges.get(other, {}).pop(last, None)
+        for node in dirty | ends:
+            if node in self.nodes:
+                self.walk_all(node)
+            else:
+                self.edges.pop(node, None)
+
+    # ------------------ Searching ------------------
+
+    def anchors(self, cell):
+        """ Graph nodes reachable from any open cell along its corridor: [(node, distance)] """
+        if cell in self.nodes:
+            return [(cell, 0)]
+        info = self.corridor_of.get(cell)
+        if info is None:
+            return []
+        node, first, offset = info
+        other, length, _ = self.edges[node][first]
+        return [(node, offset), (other, length - offset)]
+
+    def find_path(self, start, goal):
+        """ A* over corridors (Manhattan heuristic); returns a GraphPath expanded to cells lazily """
+        self.nodes_expanded = 0
+        if start == goal:
+            return GraphPath(self, start, [], goal, 0)
+
+        goal_links = {}  # a loop corridor anchors the goal to one node twice: keep the shorter way
+        for node, d in self.anchors(goal):
+            if d < goal_links.get(node, float("inf")):
+                goal_links[node] = d
+        best = None  # (total, via node)
+        # Start and goal on the same corridor: walking straight there may be shortest
+        s_info, g_info = self.corridor_of.get(start), self.corridor_of.get(goal)
+        if s_info and g_info and s_info[:2] == g_info[:2]:
+            best = (abs(s_info[2] - g_info[2]), None)
+
+        gx, gy = goal
+        dist, parent = {}, {}
+        heap = []
+        for node, d in self.anchors(start):
+            if d < dist.get(node, float("inf")):
+                dist[node] = d
+                parent[node] = None
+                heapq.heappush(heap, (d + abs(node[0] - gx) + abs(node[1] - gy), d, node))
+
+        while heap:
+            f, d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            if best is not None and f >= best[0]:
+                break
+            self.nodes_expanded += 1
+            if node in goal_links and (best is None or d + goal_links[node] < best[0]):
+                best = (d + goal_links[node], node)
+            for first, (other, length, _) in self.edges.get(node, {}).items():
+                nd = d + length
+                if nd < dist.get(other, float("inf")):
+                    dist[other] = nd
+                    parent[other] = (node, first)
+                    heapq.heappush(heap, (nd + abs(other[0] - gx) + abs(other[1] - gy), nd, other))
+
+        if best is None:
+            return GraphPath(self, start, None, goal, 0)
+        total, last = best
+        hops = []
+        node = last
+        while node is not None and parent.get(node) is not None:
+            hops.append(parent[node])
+            node = parent[node][0]
+        hops.reverse()
+        return GraphPath(self, start, hops, goal, total, entry=node, exit_node=last)
+
+    def walk_cells(self, node, first):
+        """ Cells from first up to and including the node at the other end """
+        other = self.edges[node][first][0]
+        prev, cur = node, first
+        while True:
+            yield cur
+            if cur == other and (cur in self.nodes):
+                return
+            nxt = [c for c in self.open_neighbors(cur) if c != prev]
+            prev, cur = cur, nxt[0]
+
+
+class GraphPath:
+    """ Cell path from a graph search, expanded one corridor at a time as it is consumed.
+
+    Supports what Monster needs from a path: truthiness, len, path[0], path[-1], popleft().
+    """
+
+    def __init__(self, graph, start, hops, goal, length, entry=None, exit_node=None):
+        self.graph = graph
+        self.goal = goal
+        self.length = length if hops is not None else 0
+        self.buffer = deque()   # cells expanded but not consumed yet
+        self.pending = deque()  # segments still to expand
+        if not self.length:
+            return
+        if entry is None:
+            self.pending.append(("line", start, goal))  # same corridor, no node on the way
+            return
+        if start != entry:
+            self.pending.append(("line", start, entry))
+        self.pending.extend(("hop", node, first) for node, first in hops)
+        if exit_node != goal:
+            self.pending.append(("line", exit_node, goal))
+
+    def _expand(self):
+        kind, a, b = self.pending.popleft()
+        if kind == "hop":
+            self.buffer.extend(self.graph.walk_cells(a, b))
+        else:
+            self.buffer.extend(self._corridor_cells(a, b))
+
+    def _corridor_cells(self, a, b):
+        """ Cells from a (excluded) to b (included) inside one corridor """
+        nodes = self.graph.nodes
+        parents = {a: None}
+        queue = deque([a])
+        while queue:
+            cur = queue.popleft()
+            if cur == b:
+                break
+            for nxt in self.graph.open_neighbors(cur):
+                if nxt not in parents and (nxt == b or nxt not in nodes):
+                    parents[nxt] = cur
+                    queue.append(nxt)
+        cells = []
+        cur = b
+        while cur is not None and cur != a:
+            cells.append(cur)
+            cur = parents.get(cur)
+        cells.reverse()
+        return cells
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, i):
+        if i == -1 and self.length:
+            return self.goal
+        while len(self.buffer) <= i and self.pending:
+            self._expand()
+        return self.buffer[i]
+
+    def __iter__(self):
+        while self.length:
+            yield self.popleft()
+
+    def popleft(self):
+        if not self.buffer:
+            self._expand()
+        self.length -= 1
+        return self.buffer.popleft()
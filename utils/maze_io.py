@@ -0,0 +1,139 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from utils.maze_generator import Maze
+from utils.flow_field import DistanceField
+
+# Single maze record, little endian (integer arrays are byteswapped on big-endian hosts):
+#   magic "MAZE", format version, flags, cols, rows, seed,
+#   then the bit-packed wall grid (1 bit per cell, row-major, LSB first),
+#   then, if FLAG_DISTANCES, one int32 per cell: BFS distance to the exit (-1 = unreachable)
+MAGIC = b"MAZE"
+PACK_MAGIC = b"MZPK"
+VERSION = 1
+FLAG_DISTANCES = 1
+HEADER = struct.Struct("<4sHHIIQ")
+PACK_HEADER = struct.Struct("<4sHHI")  # magic, version, reserved, maze count; then count x uint64 offsets
+
+# byte value <-> the 8 cells (0/1 bytes) it packs, so packing is a lookup per 8 cells
+_UNPACK = [bytes((v >> bit) & 1 for bit in range(8)) for v in range(256)]
+_PACK = {cells: v for v, cells in enumerate(_UNPACK)}
+BIG_ENDIAN = sys.byteorder == "big"
+
+
+def pack_bits(cells):
+    n = len(cells)
+    padded = bytes(cells) + bytes(-n % 8)
+    return bytes(_PACK[padded[i:i + 8]] for i in range(0, len(padded), 8))
+
+def unpack_bits(data, n):
+    return b"".join(_UNPACK[b] for b in data)[:n]
+
+
+def le_bytes(values, typecode):
+    """ Integer array as little-endian bytes whatever the host byte order """
+    values = array(typecode, values)
+    if BIG_ENDIAN:
+        values.byteswap()
+    return values.tobytes()
+
+def le_view(buf, start, count, typecode):
+    """ Little-endian integers at buf[start:]: a zero-copy view on little-endian hosts,
+    a byteswapped copy on big-endian ones """
+    size = array(typecode).itemsize
+    view = memoryview(buf)[start:start + size * count].cast(typecode)
+    if not BIG_ENDIAN:
+        return view
+    values = array(typecode, view)
+    values.byteswap()
+    return values
+
+
+def exit_distances(maze):
+    field = DistanceField(maze)
+    field.compute((maze.cols - 1, maze.rows - 2))
+    return field.dist
+
+def encode_maze(maze, distances=False):
+    """ One maze as bytes (see the format notes at the top of this file) """
+    flags = FLAG_DISTANCES if distances else 0
+    parts = [HEADER.pack(MAGIC, VERSION, flags, maze.cols, maze.rows, maze.seed), pack_bits(maze.cells)]
+    if distances:
+        parts.append(le_bytes(exit_distances(maze), "i"))
+    return b"".join(parts)
+
+def save_maze(maze, path, distances=True):
+    with open(path, "wb") as f:
+        f.write(encode_maze(maze, distances))
+
+def decode_maze(buf, offset=0, cell_size=20):
+    """ Build a Maze from a record at buf[offset:] (buf can be an mmap). Returns (maze, end offset) """
+    magic, version, flags, cols, rows, seed = HEADER.unpack_from(buf, offset)
+    if magic != MAGIC:
+        raise ValueError("not a maze record")
+    if version != VERSION:
+        raise ValueError(f"unsupported maze format version {version}")
+    n = cols * rows
+    start = offset + HEADER.size
+    end = start + (n + 7) // 8
+
+    maze = Maze(cols, rows, cell_size, seed=seed)
+    maze.cells[:] = unpack_bits(buf[start:end], n)  # same size, so grid row views stay valid
+    maze.progress = 1.0
+    maze.invalidate()
+
+    maze.exit_distances = None
+    if flags & FLAG_DISTANCES:
+        # Zero-copy int32 view straight into the file mapping (little-endian hosts)
+        maze.exit_distances = le_view(buf, end, n, "i")
+        end += 4 * n
+    return maze, end
+
+
+def _map(path):
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def load_maze(path, cell_size=20):
+    maze, _ = decode_maze(_map(path), 0, cell_size)
+    return maze
+
+
+def save_pack(mazes, path, distances=False):
+    """ Level pack: header, offset table, then one maze record per maze """
+    records = [encode_maze(maze, distances) for maze in mazes]
+    offset = PACK_HEADER.size + 8 * len(records)
+    offsets = []
+    for record in records:
+        offsets.append(offset)
+        offset += len(record)
+    with open(path, "wb") as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, VERSION, 0, len(records)))
+        f.write(le_bytes(offsets, "Q"))
+        for record in records:
+            f.write(record)
+
+class MazePack:
+    """ Memory-mapped level pack; each maze is decoded only when indexed """
+
+    def __init__(self, path, cell_size=20):
+        self.cell_size = cell_size
+        self.buf = _map(path)
+        magic, version, _, count = PACK_HEADER.unpack_from(self.buf, 0)
+        if magic != PACK_MAGIC:
+            raise ValueError("not a maze pack")
+        if version != VERSION:
+            raise ValueError(f"unsupported maze pack version {version}")
+        self.offsets = le_view(self.buf, PACK_HEADER.size, count, "Q")
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, i):
+        return decode_maze(self.buf, self.offsets[i], self.cell_size)[0]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
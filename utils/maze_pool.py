@@ -0,0 +1,115 @@
+import random
+import threading
+from collections import deque
+
+from utils.maze_generator import Maze, check_backend
+
+def build(maze):
+    """ Generate the maze and the indexes gameplay reads from the first tick (line of sight),
+    so their cost lands on the loading screen rather than in the first frames """
+    maze.generate_maze()
+    maze.visibility()
+
+
+class MazePool:
+    """ Background thread that keeps a few generated mazes ready to play """
+
+    def __init__(self, cols, rows, cell_size, size=2, seed=None, backend="prim"):
+        check_backend(backend)  # here, not in the worker thread where it would only kill the thread
+        self.cols = cols
+        self.rows = rows
+        self.cell_size = cell_size
+        self.size = size
+        self.backend = backend
+        self.seeds = random.Random(seed)  # seed of the pool -> seed of every maze
+        self.ready = deque()
+        self.building = None  # maze currently being generated (for progress)
+        self.cond = threading.Condition()
+        self.running = False
+        self.paused = False  # no new mazes while a game is being played
+        self.error = None  # exception that stopped the worker, re-raised to callers
+        self.thread = None
+
+    def start(self):
+        if self.running:
+            return self
+        self.running = True
+        self.thread = threading.Thread(target=self._worker, name="maze-pool", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def pause(self):
+        """ Stop starting new mazes (one already being built is finished) so gameplay keeps the CPU """
+        with self.cond:
+            self.paused = True
+
+    def resume(self):
+        with self.cond:
+            self.paused = False
+            self.cond.notify_all()
+
+    def _worker(self):
+        try:
+            self._fill()
+        except Exception as error:
+            with self.cond:
+                self.error = error
+                self.building = None
+                self.cond.notify_all()
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise RuntimeError("maze pool worker failed") from self.error
+
+    def _fill(self):
+        while True:
+            with self.cond:
+                while self.running and (self.paused or len(self.ready) >= self.size):
+                    self.cond.wait()
+                if not self.running:
+                    return
+                maze = Maze(self.cols, self.rows, self.cell_size, seed=self.seeds.randrange(2**32),
+                            backend=self.backend)
+                self.building = maze
+
+            build(maze)  # heavy part runs without holding the lock
+
+            with self.cond:
+                self.ready.append(maze)
+                self.building = None
+                self.cond.notify_all()
+
+    def progress(self):
+        """ 0.0 - 1.0 progress of the next maze that get() will return """
+        if self.ready:
+            return 1.0
+        self._raise_error()
+        building = self.building
+        return building.progress if building else 0.0
+
+    def has_ready(self):
+        return bool(self.ready)
+
+    def get(self):
+        """ Pop a finished maze, waiting for the worker only if none is ready """
+        with self.cond:
+            if not self.running and not self.ready:
+                # Pool not started: build inline so callers always get a maze
+                maze = Maze(self.cols, self.rows, self.cell_size, seed=self.seeds.randrange(2**32),
+                            backend=self.backend)
+                build(maze)
+                return maze
+            while not self.ready:
+                self._raise_error()
+                self.cond.wait()
+            maze = self.ready.popleft()
+            self.cond.notify_all()  # wake the worker to refill
+            return maze
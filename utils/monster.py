@@ -1,74 +1,105 @@
-import pygame
+import math
 import random
+from array import array
 from collections import deque 
 
+from utils.pathfinding import IncrementalPath
+from utils.assets import assets
+from utils.flow_field import UNREACHABLE
+from utils.perception import line_of_sight
+
+# FSM states in speed order; MonsterGroup stores the index, not the name
+STATES = ("idle", "alert", "chase", "frenzy")
+# Cells per second in each state; every monster takes its own copy so it can be tuned
+SPEEDS = {
+    "idle": 2.8,
+    "alert": 3.3,
+    "chase": 3.8,
+    "frenzy": 4.8
+}
+
+def load_monster_image(path, cell_size):
+    """ Monster sprite scaled to one cell, shared through the asset cache; red square if missing """
+    return assets.image(path, (cell_size - 1, cell_size - 1), fallback=(255, 0, 0),
+                        fallback_size=(cell_size - 2, cell_size - 2))
+
 class Monster:
     def __init__(self, x, y, cell_size, image_path='assets/Monster/monster.png'):
         self.x, self.y = int(x), int(y)
         self.cell_size = cell_size
-        self.load_image(image_path)
-        self.rect = self.image.get_rect()
+        self.image = None  # image_path=None runs headless without loading assets
+        if image_path:
+            self.image = load_monster_image(image_path, cell_size)
+            self.rect = self.image.get_rect()
         
         # Movement properties
         self.move_progress = 0.0
-        self.speeds = {
-            "idle": 2.8,    # cells per second
-            "alert": 3.3,
-            "chase": 3.8,
-            "frenzy": 4.8
-        }
+        self.speeds = dict(SPEEDS)
         self.state = "idle"
-        self.path = []
-
-    def load_image(self, path):
-        """Load and scale monster image"""
-        try:
-            self.image = pygame.image.load(path).convert_alpha()
-            self.image = pygame.transform.scale(self.image, (self.cell_size - 1, self.cell_size - 1))
-        except:
-            # Fallback if image missing
-            self.image = pygame.Surface((self.cell_size - 2, self.cell_size - 2))
-            self.image.fill((255, 0, 0))  # Red square
+        self.distance = math.inf  # walking distance to the player seen by the last update_state
+        self.planner = IncrementalPath()  # repaired between ticks instead of re-searched
+        self.path = self.planner
+        self.replan_distance = 3  # replan once the player is this far from the path end
+        self.searches = 0  # planner updates so far, and cells they expanded in total (for profiling)
+        self.nodes_expanded = 0
+        self.sight_range = 30  # straight-line sight, in cells
 
     def manhattan_distance(self, pos1, pos2):
         return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
 
-    def update_state(self, player_pos):
-        distance = self.manhattan_distance((self.x, self.y), player_pos)
+    def update_state(self, player_pos, distance=None, visible=False):
+        """ distance is the walking distance to the player (Manhattan if unknown, None if unreachable);
+        a player in plain sight is chased whatever the distance """
+        if distance is None:
+            distance = self.manhattan_distance((self.x, self.y), player_pos)
+        elif distance == UNREACHABLE:
+            distance = math.inf
+        self.distance = distance
         if distance > 15: self.state = "idle"
         elif distance > 10: self.state = "alert"
         elif distance > 5: self.state = "chase"
         else: self.state = "frenzy"
+        if visible and self.state in ("idle", "alert"):
+            self.state = "chase"
 
     def update(self, maze, player_pos, delta_time):
-        self.update_state(player_pos)
-        
-        if not self.path or self.manhattan_distance(self.path[-1], player_pos) > 3:
-            self.path = self.bfs_path(maze, (self.x, self.y), player_pos)
+        # Replan when out of path, when the player drifted, or after a grid edit (the planner
+        # cuts the path at new walls and splices around them)
+        if (not self.path or self.manhattan_distance(self.path[-1], player_pos) > self.replan_distance
+                or self.planner.maze_version != maze.version):
+            self.path = self.planner.update(maze, (self.x, self.y), player_pos)
+            self.searches += 1
+            self.nodes_expanded += self.planner.nodes_expanded
+        # The planned path ends at the player, so its length is the walking distance
+        distance = len(self.path) if self.path else None
+        visible = line_of_sight(maze, (self.x, self.y), player_pos, self.sight_range)
+        self.update_state(player_pos, distance, visible)
         
         if self.path:
             target_x, target_y = self.path[0]
             if (self.x, self.y) == (target_x, target_y):
-                self.path.pop(0)
+                self.path.popleft()
                 self.move_progress = 0.0
             else:
                 self.move_progress += self.speeds[self.state] * delta_time
                 if self.move_progress >= 1.0:
                     self.x, self.y = target_x, target_y
+                    self.path.popleft()  # O(1), keeps path[0] adjacent to the monster
                     self.move_progress = 0.0
 
     def bfs_path(self, maze, start, target):
         queue= deque([start])
         visited = {start: None}
         directions = [(1,0), (-1,0), (0,1), (0,-1)]
+        cols, rows, cells = maze.cols, maze.rows, maze.cells
         
         while queue:
             current = queue.popleft()
             if current == target: break
             for dx, dy in directions:
                 nx, ny = current[0] + dx, current[1] + dy
-                if (0 <= nx < maze.cols and 0 <= ny < maze.rows 
-                    and maze.grid[ny][nx] == 0 
+                if (0 <= nx < cols and 0 <= ny < rows 
+                    and cells[ny * cols + nx] == 0 
                     and (nx, ny) not in visited):
                     visited[(nx, ny)] = current
                     queue.append((nx, ny))
@@ -83,6 +114,7 @@ class Monster:
         return path
 
     def draw(self, screen, maze_rect):
+        """ Returns the screen rect touched """
         if self.path and self.move_progress > 0:
             tx, ty = self.path[0]
             render_x = self.x + (tx - self.x) * self.move_progress
@@ -90,8 +122,222 @@ class Monster:
         else:
             render_x, render_y = self.x, self.y
         
-        screen.blit(
+        return screen.blit(
             self.image,
             (maze_rect.x + render_x * self.cell_size,
              maze_rect.y + render_y * self.cell_size)
-        )
\ No newline at end of file
+        )
+
+
+class MonsterGroup:
+    """ Any number of monsters updated as one batch over parallel arrays """
+
+    def __init__(self, maze, cell_size, image_path='assets/Monster/monster.png'):
+        self.maze = maze
+        self.cols = maze.cols
+        self.cell_size = cell_size
+        self.image = None  # image_path=None runs headless without loading assets
+        if image_path:
+            self.image = load_monster_image(image_path, cell_size)  # shared by every monster
+
+        self.speeds = dict(SPEEDS)
+        self.thresholds = (15, 10, 5)  # path distance above which: idle, alert, chase
+        self.replan_distance = 0  # field is rebuilt once the player drifts further than this
+        self.last_dt = 0.0  # tick length of the last update, used to interpolate drawing
+        self.events = []  # (index, old state, new state, distance) for FSM changes in the last update
+
+        # One slot per monster in every array
+        self.xs = array('i')
+        self.ys = array('i')
+        self.target_xs = array('i')  # next cell, -1 when standing still
+        self.target_ys = array('i')
+        self.progress = array('d')
+        self.states = bytearray()  # index into STATES
+        # Monsters per cell, so catching the player is one lookup
+        self.occupancy = array('H', [0]) * (maze.cols * maze.rows)
+
+    def __len__(self):
+        return len(self.xs)
+
+    def add(self, x, y):
+        self.xs.append(int(x))
+        self.ys.append(int(y))
+        self.target_xs.append(-1)
+        self.target_ys.append(-1)
+        self.progress.append(0.0)
+        self.states.append(0)
+        self.occupancy[int(y) * self.cols + int(x)] += 1
+
+    def spawn_random(self, maze, rng, count=1, min_distance=10, max_distance=None):
+        """ Add monsters on random open cells at least min_distance from the start (1,1),
+        and at most max_distance (e.g. a bounded field's radius) when given """
+        def eligible(x, y):
+            d = math.hypot(x - 1, y - 1)
+            return (maze.is_open(x, y) and d >= min_distance
+                    and (max_distance is None or d <= max_distance))
+
+        checked = False
+        for _ in range(count):
+            x, y = rng.randint(3, maze.cols - 2), rng.randint(3, maze.rows - 2)
+            tries = 1
+            while not eligible(x, y):
+                if tries >= 1000 and not checked:
+                    # Plenty of misses: make sure some cell qualifies before sampling on forever
+                    if not any(eligible(cx, cy) for cy in range(3, maze.rows - 1) for cx in range(3, maze.cols - 1)):
+                        reach = f"{min_distance}-{max_distance}" if max_distance is not None else f"at least {min_distance}"
+                        raise ValueError(f"no open cell in a {maze.cols}x{maze.rows} maze is {reach} cells "
+                                         f"from the start to spawn a monster on")
+                    checked = True
+                x, y = rng.randint(3, maze.cols - 2), rng.randint(3, maze.rows - 2)
+                tries += 1
+            self.add(x, y)
+
+    def positions(self):
+        return list(zip(self.xs, self.ys))
+
+    def state(self, i):
+        return STATES[self.states[i]]
+
+    def occupies(self, pos):
+        """ True if any monster stands on this cell """
+        x, y = pos
+        return self.occupancy[y * self.cols + x] > 0
+
+    def update(self, player_pos, delta_time, field):
+        """ Step every monster one tick along the shared distance field """
+        far, near, close = self.thresholds
+        self.last_dt = delta_time
+        speed_table = [self.speeds[name] * delta_time for name in STATES]
+        xs, ys = self.xs, self.ys
+        target_xs, target_ys = self.target_xs, self.target_ys
+        progress, states, occupancy = self.progress, self.states, self.occupancy
+        cols = self.cols
+        next_step = field.next_step
+        far_field = field.far  # whole-maze fallback when field is bounded
+        can_see = self.maze.visibility().can_see
+        events = self.events
+        events.clear()
+
+        for i in range(len(xs)):
+            x, y = xs[i], ys[i]
+            # True walking distance read from the shared field (no search), and O(1) sight
+            distance = field.dist[y * cols + x]
+            if distance == UNREACHABLE or distance > far: state = 0
+            elif distance > near: state = 1
+            elif distance > close: state = 2
+            else: state = 3
+            if state < 2 and can_see((x, y), player_pos):
+                state = 2  # player in plain sight
+            if state != states[i]:
+                events.append((i, states[i], state, distance))
+                states[i] = state
+
+            if progress[i] == 0.0:
+                step = next_step((x, y))
+                if step is None and field.source != player_pos:
+                    # Reached where the player was: replan now, like an exhausted path
+                    field.compute(player_pos)
+                    step = next_step((x, y))
+                if step is None and far_field is not None:
+                    step = far_field.next_step((x, y))  # beyond the bounded field: keep closing in
+                if step is None:
+                    target_xs[i] = -1
+                    continue
+                target_xs[i], target_ys[i] = step
+            elif target_xs[i] < 0:
+                continue
+
+            moved = progress[i] + speed_table[state]
+            if moved >= 1.0:
+                occupancy[y * cols + x] -= 1
+                x, y = xs[i], ys[i] = target_xs[i], target_ys[i]
+                occupancy[y * cols + x] += 1
+                target_xs[i] = -1
+                progress[i] = 0.0
+            else:
+                progress[i] = moved
+
+    def draw(self, screen, maze_rect, alpha=0.0, camera=None):
+        """ alpha is the fraction of a tick since the last update, for smooth movement.
+        With a camera, monsters outside the view are skipped before any blit.
+        Returns the screen rects touched. """
+        size = self.cell_size
+        image = self.image
+        step = [self.speeds[name] * self.last_dt * alpha for name in STATES]
+        if camera is not None:
+            x0, y0, x1, y1 = camera.visible_cells()
+            x0, y0, x1, y1 = x0 - 1, y0 - 1, x1 + 1, y1 + 1  # sprites sliding in from outside
+        rects = []
+        for i in range(len(self.xs)):
+            render_x, render_y = self.xs[i], self.ys[i]
+            if camera is not None and not (x0 <= render_x < x1 and y0 <= render_y < y1):
+                continue
+            if self.target_xs[i] >= 0:
+                p = min(self.progress[i] + step[self.states[i]], 1.0)
+                render_x += (self.target_xs[i] - render_x) * p
+                render_y += (self.target_ys[i] - render_y) * p
+            rects.append(screen.blit(image, (maze_rect.x + render_x * size, maze_rect.y + render_y * size)))
+        return rects
+
+
+class MonsterList:
+    """ Monsters that each path-find on their own (IncrementalPath), for mazes without a
+    flat grid such as the endless ChunkedMaze. Same interface as MonsterGroup. """
+
+    def __init__(self, maze, cell_size, image_path='assets/Monster/monster.png', leash=48, rng=None):
+        self.maze = maze
+        self.cell_size = cell_size
+        self.image_path = image_path
+        self.leash = leash  # monsters left further behind than this respawn near the player
+        self.rng = rng or random  # where respawns land; seed it to make a run reproducible
+        self.replan_distance = 0
+        self.monsters = []
+        self.events = []  # (index, old state, new state, distance), as MonsterGroup.events
+
+    def __len__(self):
+        return len(self.monsters)
+
+    def add(self, x, y):
+        monster = Monster(x, y, self.cell_size, self.image_path)
+        monster.replan_distance = self.replan_distance
+        self.monsters.append(monster)
+        return monster
+
+    def random_cell_near(self, center, rng, min_distance=12, max_distance=20):
+        """ Random open cell whose Manhattan distance to center is in [min_distance, max_distance] """
+        cx, cy = center
+        while True:
+            dx = rng.randint(-max_distance, max_distance)
+            dy = rng.randint(-max_distance, max_distance)
+            if min_distance <= abs(dx) + abs(dy) <= max_distance and self.maze.is_open(cx + dx, cy + dy):
+                return cx + dx, cy + dy
+
+    def spawn_near(self, center, rng, count=1):
+        for _ in range(count):
+            self.add(*self.random_cell_near(center, rng))
+
+    def positions(self):
+        return [(m.x, m.y) for m in self.monsters]
+
+    def occupies(self, pos):
+        return any((m.x, m.y) == pos for m in self.monsters)
+
+    def search_stats(self):
+        """ (path searches, cells expanded) so far, summed over monsters """
+        return sum(m.searches for m in self.monsters), sum(m.nodes_expanded for m in self.monsters)
+
+    def update(self, player_pos, delta_time, field=None):
+        self.events.clear()
+        for i, monster in enumerate(self.monsters):
+            if monster.manhattan_distance((monster.x, monster.y), player_pos) > self.leash:
+                monster.x, monster.y = self.random_cell_near(player_pos, self.rng)
+                monster.planner.clear()
+                monster.move_progress = 0.0
+            old_state = monster.state
+            monster.update(self.maze, player_pos, delta_time)
+            if monster.state != old_state:
+                self.events.append((i, STATES.index(old_state), STATES.index(monster.state), monster.distance))
+
+    def draw(self, screen, maze_rect, alpha=0.0, camera=None):
+        return [monster.draw(screen, maze_rect) for monster in self.monsters
+                if camera is None or camera.is_visible(monster.x, monster.y)]
@@ -0,0 +1,178 @@
+from collections import deque
+
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+class IncrementalPath:
+    """ Monster -> player path that is repaired locally instead of re-searched from scratch.
+
+    D* Lite / LPA* keep their search tree rooted at a fixed goal, but here both ends move
+    (the monster walks the path, the player runs away), so the search state we keep is the
+    path itself plus an index of its cells:
+      - player moves: search outward from the player only until the old path is hit, then splice
+      - wall appears on the path: cut the path before it and splice back the same way
+      - monster steps: O(1) pop from the front
+    A full search only happens when there is no usable path or after max_repairs splices,
+    and it runs on the maze's corridor graph rather than cell by cell.
+    """
+
+    def __init__(self, max_repairs=32):
+        self.cells = []   # path cells; the live path is cells[head:]
+        self.head = 0
+        self.index = {}   # cell -> absolute position in self.cells
+        self.goal = None
+        self.maze_version = None
+        self.max_repairs = max_repairs
+        self.repairs = 0
+        self.nodes_expanded = 0  # cells expanded by the last update
+        self.full_searches = 0
+
+    # --- sequence interface used by Monster (path[0], len, truthiness) ---
+
+    def __len__(self):
+        return len(self.cells) - self.head
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("path index out of range")
+        return self.cells[self.head + i]
+
+    def __iter__(self):
+        return iter(self.cells[self.head:])
+
+    def popleft(self):
+        """ Consume the next step in O(1) """
+        cell = self.cells[self.head]
+        del self.index[cell]
+        self.head += 1
+        if self.head > 64 and self.head * 2 > len(self.cells):
+            self._compact()
+        return cell
+
+    def clear(self):
+        self.cells = []
+        self.head = 0
+        self.index = {}
+
+    def _compact(self):
+        self.cells = self.cells[self.head:]
+        self.head = 0
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+
+    def _truncate_after(self, pos):
+        """ Drop every cell after absolute position pos """
+        for cell in self.cells[pos + 1:]:
+            del self.index[cell]
+        del self.cells[pos + 1:]
+
+    def _append(self, cell):
+        self.index[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    # --- planning ---
+
+    def update(self, maze, start, goal):
+        """ Bring the path from start (monster cell, not included) to goal up to date """
+        self.nodes_expanded = 0
+
+        if self.maze_version != maze.version:
+            self.maze_version = maze.version
+            self._cut_at_walls(maze)
+
+        # Path must begin next to the monster, otherwise it is not ours any more
+        if len(self):
+            fx, fy = self[0]
+            if abs(fx - start[0]) + abs(fy - start[1]) != 1:
+                self.clear()
+
+        if goal == self.goal and (len(self) or start == goal):
+            return self
+
+        if not len(self) or self.repairs >= self.max_repairs:
+            self._full_search(maze, start, goal)
+        else:
+            self._repair(maze, start, goal)
+        self.goal = goal
+        return self
+
+    def _cut_at_walls(self, maze):
+        """ After a grid edit, keep only the prefix of the path that is still open """
+        for pos in range(self.head, len(self.cells)):
+            if not maze.is_open(*self.cells[pos]):
+                self._truncate_after(pos - 1)
+                self.goal = None  # force a splice back to the goal
+                return
+
+    def _repair(self, maze, start, goal):
+        if goal in self.index:
+            # Player stepped back onto the path: just shorten it
+            self._truncate_after(self.index[goal])
+            return
+
+        # Search outward from the player until we touch the path (or the monster)
+        parents = self._search(maze, goal, lambda cell: cell in self.index or cell == start)
+        hit = parents.pop("hit", None)
+        if hit is None:
+            self.clear()  # player unreachable
+            return
+
+        if hit == start:
+            self.clear()
+        else:
+            self._truncate_after(self.index[hit])
+        # parents point from the hit cell back toward the goal
+        cell = parents[hit]
+        while cell is not None:
+            self._append(cell)
+            cell = parents[cell]
+        self.repairs += 1
+
+    def _full_search(self, maze, start, goal):
+        """ Search the corridor graph, then unpack it into cells (splicing needs every cell) """
+        self.clear()
+        self.repairs = 0
+        self.full_searches += 1
+        if not hasattr(maze, "corridor_graph"):
+            # Endless maze: no global graph, plain BFS bounded by maze.search_limit
+            parents = self._search(maze, goal, lambda cell: cell == start)
+            if parents.pop("hit", None) is not None:
+                cell = parents[start]
+                while cell is not None:
+                    self._append(cell)
+                    cell = parents[cell]
+            return
+        graph = maze.corridor_graph()
+        for cell in graph.find_path(start, goal):
+            self._append(cell)
+        self.nodes_expanded += graph.nodes_expanded
+
+    def _search(self, maze, origin, is_target):
+        """ BFS from origin; parents[c] is the next cell toward origin. Sets parents["hit"] """
+        is_open = maze.is_open
+        limit = maze.search_limit
+        parents = {origin: None}
+        if is_target(origin):
+            parents["hit"] = origin
+            return parents
+        queue = deque([origin])
+        expanded = 0
+        while queue:
+            if limit is not None and expanded >= limit:
+                break
+            cx, cy = current = queue.popleft()
+            expanded += 1
+            for dx, dy in DIRECTIONS:
+                nx, ny = cx + dx, cy + dy
+                if is_open(nx, ny):
+                    cell = (nx, ny)
+                    if cell in parents:
+                        continue
+                    parents[cell] = current
+                    if is_target(cell):
+                        parents["hit"] = cell
+                        self.nodes_expanded += expanded
+                        return parents
+                    queue.append(cell)
+        self.nodes_expanded += expanded
+        return parents
@@ -0,0 +1,87 @@
+from array import array
+
+NO_RUN = -1
+
+class VisibilityIndex:
+    """ Straight-line sight between cells of a Maze, answered in O(1).
+
+    Every open cell stores the id of the horizontal and the vertical corridor run it lies on
+    (the flat index of the run's first cell). Two cells see each other when they share a row
+    and a row run, or a column and a column run: nothing but open cells lies between them.
+    """
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.cols = maze.cols
+        self.rows = maze.rows
+        self.row_runs = array('i', [NO_RUN]) * (self.cols * self.rows)
+        self.col_runs = array('i', [NO_RUN]) * (self.cols * self.rows)
+        self.version = None
+        self.build()
+
+    def build(self):
+        for y in range(self.rows):
+            self.build_row(y)
+        for x in range(self.cols):
+            self.build_column(x)
+        self.version = self.maze.version
+
+    def build_row(self, y):
+        cells, runs, cols = self.maze.cells, self.row_runs, self.cols
+        run = NO_RUN
+        for i in range(y * cols, (y + 1) * cols):
+            if cells[i]:
+                run = NO_RUN
+            elif run == NO_RUN:
+                run = i
+            runs[i] = run
+
+    def build_column(self, x):
+        cells, runs, cols = self.maze.cells, self.col_runs, self.cols
+        run = NO_RUN
+        for i in range(x, self.cols * self.rows, cols):
+            if cells[i]:
+                run = NO_RUN
+            elif run == NO_RUN:
+                run = i
+            runs[i] = run
+
+    def update_cells(self, cells):
+        """ A changed cell only affects runs in its own row and column """
+        for y in {y for _, y in cells}:
+            self.build_row(y)
+        for x in {x for x, _ in cells}:
+            self.build_column(x)
+        self.version = self.maze.version
+
+    def can_see(self, a, b, max_range=None):
+        (ax, ay), (bx, by) = a, b
+        if max_range is not None and abs(ax - bx) + abs(ay - by) > max_range:
+            return False
+        if not (0 <= ax < self.cols and 0 <= ay < self.rows and 0 <= bx < self.cols and 0 <= by < self.rows):
+            return False
+        i, j = ay * self.cols + ax, by * self.cols + bx
+        if ay == by:
+            return self.row_runs[i] != NO_RUN and self.row_runs[i] == self.row_runs[j]
+        if ax == bx:
+            return self.col_runs[i] != NO_RUN and self.col_runs[i] == self.col_runs[j]
+        return False
+
+
+def line_of_sight(maze, a, b, max_range=None):
+    """ Sight check for any maze: O(1) through Maze.visibility(), otherwise a walk along
+    the line (endless ChunkedMaze), which max_range keeps short """
+    if hasattr(maze, "visibility"):
+        return maze.visibility().can_see(a, b, max_range)
+    (ax, ay), (bx, by) = a, b
+    if ax != bx and ay != by:
+        return False
+    if max_range is not None and abs(ax - bx) + abs(ay - by) > max_range:
+        return False
+    dx, dy = (bx > ax) - (bx < ax), (by > ay) - (by < ay)
+    x, y = ax, ay
+    while (x, y) != (bx, by):
+        if not maze.is_open(x, y):
+            return False
+        x, y = x + dx, y + dy
+    return maze.is_open(bx, by)
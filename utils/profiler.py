@@ -0,0 +1,138 @@
+import csv
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import pygame
+
+_NO_PHASE = nullcontext()
+
+class _Phase:
+    """ Context manager adding its elapsed time to one phase of the current frame """
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        current = self.profiler.current
+        current[self.name] = current.get(self.name, 0.0) + time.perf_counter() - self.start
+
+
+class FrameProfiler:
+    """ Per-phase frame timings and per-frame counters over a rolling window of frames.
+
+    Wrap each phase in `with profiler.phase("name"):`, add counts with count(), and call
+    end_frame() once per frame. Percentiles, the overlay and the exports all use the last
+    `window` frames. A disabled profiler costs one no-op context manager per phase.
+    """
+
+    def __init__(self, enabled=False, window=600, overlay_interval=15):
+        self.enabled = enabled
+        self.window = window
+        self.frames = deque(maxlen=window)  # one dict per frame: phase ms and counters
+        self.phases = []  # phase names in first-seen order, for stable columns
+        self.counters = []
+        self.current = {}  # phase -> seconds so far this frame
+        self.current_counts = {}
+        self.frame_start = time.perf_counter()
+        self.frame_count = 0
+        self.overlay_interval = overlay_interval  # frames between overlay refreshes
+        self.overlay_surface = None
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NO_PHASE
+        return _Phase(self, name)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.current_counts[name] = self.current_counts.get(name, 0) + n
+
+    def end_frame(self):
+        now = time.perf_counter()
+        if self.enabled:
+            record = {"frame": self.frame_count, "total": (now - self.frame_start) * 1000}
+            for name, seconds in self.current.items():
+                if name not in self.phases:
+                    self.phases.append(name)
+                record[name] = seconds * 1000
+            for name, n in self.current_counts.items():
+                if name not in self.counters:
+                    self.counters.append(name)
+                record[name] = n
+            self.frames.append(record)
+            self.current = {}
+            self.current_counts = {}
+        self.frame_count += 1
+        self.frame_start = now
+
+    # ------------------ Statistics ------------------
+
+    def percentiles(self, name, points=(50, 95, 99)):
+        values = sorted(frame.get(name, 0) for frame in self.frames)
+        if not values:
+            return {p: 0.0 for p in points}
+        return {p: values[min(len(values) - 1, len(values) * p // 100)] for p in points}
+
+    def summary(self):
+        """ {name: {"p50", "p95", "p99", "max", "mean"}} for the frame total, phases and counters """
+        stats = {}
+        for name in ["total"] + self.phases + self.counters:
+            values = [frame.get(name, 0) for frame in self.frames]
+            p = self.percentiles(name)
+            stats[name] = {"p50": p[50], "p95": p[95], "p99": p[99],
+                           "max": max(values, default=0), "mean": sum(values) / len(values) if values else 0}
+        return stats
+
+    # ------------------ Export ------------------
+
+    def columns(self):
+        return ["frame", "total"] + self.phases + self.counters
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump({"units": "ms", "summary": self.summary(), "frames": list(self.frames)}, f, indent=1)
+
+    def export_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.columns(), restval=0)
+            writer.writeheader()
+            writer.writerows(self.frames)
+
+    def export(self, path):
+        """ JSON or CSV, picked by the file extension """
+        if path.endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
+
+    # ------------------ Overlay ------------------
+
+    def overlay(self, font):
+        """ Text panel with p50/p95 per phase, re-rendered only every overlay_interval frames """
+        if self.overlay_surface is not None and self.frame_count % self.overlay_interval:
+            return self.overlay_surface
+        lines = ["phase            p50    p95  (ms)"]
+        for name in ["total"] + self.phases:
+            p = self.percentiles(name)
+            lines.append(f"{name:<15}{p[50]:6.2f} {p[95]:6.2f}")
+        for name in self.counters:
+            p = self.percentiles(name)
+            lines.append(f"{name:<15}{p[50]:6.0f} {p[95]:6.0f}  /frame")
+        rendered = [font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(text.get_width() for text in rendered) + 10
+        height = sum(text.get_height() for text in rendered) + 10
+        surface = pygame.Surface((width, height))
+        surface.fill((0, 0, 0))
+        y = 5
+        for text in rendered:
+            surface.blit(text, (5, y))
+            y += text.get_height()
+        self.overlay_surface = surface
+        return surface
@@ -0,0 +1,336 @@
+import bisect
+import os
+import random
+import struct
+import time
+
+from utils.maze_generator import Maze
+from utils.chunked_maze import ChunkedMaze
+from utils.player import Player
+from utils.monster import MonsterGroup, MonsterList
+from utils.flow_field import DistanceField
+
+# Replay log, little endian, append-only so a crash loses at most the unflushed tail:
+#   header: magic "MZRP", format version, flags, tick rate, cols, rows (0 when endless), maze seed,
+#           distance field radius (0 = whole maze)
+#   then tagged records:
+#     "S" spawn:    uint16 count, count x (int32 x, int32 y) monster start cells, in spawn order
+#     "M" move:     varint (ticks since the previous move << 2 | direction), see DIRECTIONS
+#     "K" snapshot: uint32 tick, uint32 length, state (see pack_state), taken before that tick's moves
+#     "E" end:      uint32 tick, uint8 index into RESULTS
+# A move recorded at tick t was pressed after t sim ticks had run, so it is applied before tick t + 1.
+MAGIC = b"MZRP"
+VERSION = 2
+FLAG_ENDLESS = 1
+FLAG_NUMPY = 2
+HEADER = struct.Struct("<4sBBHHHQH")
+SPAWN = struct.Struct("<ii")
+SNAPSHOT = struct.Struct("<II")
+END = struct.Struct("<IB")
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))  # left, right, up, down
+RESULTS = ("quit", "caught", "escaped")
+SNAPSHOT_INTERVAL = 600  # ticks between snapshots (10 s at 60 ticks/s)
+
+# Snapshot payload: player x, y, move cooldown; distance field source (-1, -1 = none);
+# monster count, then per monster x, y, target x, target y, progress, FSM state;
+# for a bounded field, its FarField: finished source, pending source (-1, -1 = none), rings expanded
+_PLAYER = struct.Struct("<iid")
+_SOURCE = struct.Struct("<ii")
+_COUNT = struct.Struct("<H")
+_MONSTER = struct.Struct("<iiiidB")
+_FAR = struct.Struct("<iiiiI")
+
+
+def write_varint(value):
+    out = bytearray()
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+def read_varint(buf, offset):
+    """ (value, next offset); IndexError if buf ends mid-number """
+    value = shift = 0
+    while True:
+        byte = buf[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+# ------------------ State snapshots ------------------
+
+def pack_state(player, monsters, field):
+    """ Everything a grid game needs to resume at a tick boundary, or None for the endless
+    MonsterList (its per-monster planners are rebuilt by replaying from the start instead) """
+    if not isinstance(monsters, MonsterGroup):
+        return None
+    source = field.source if field is not None and field.source is not None else (-1, -1)
+    parts = [_PLAYER.pack(player.x, player.y, player.move_cooldown), _SOURCE.pack(*source),
+             _COUNT.pack(len(monsters))]
+    for i in range(len(monsters)):
+        parts.append(_MONSTER.pack(monsters.xs[i], monsters.ys[i], monsters.target_xs[i], monsters.target_ys[i],
+                                   monsters.progress[i], monsters.states[i]))
+    if field is not None and field.far is not None:
+        source, pending, rings = field.far.state()
+        parts.append(_FAR.pack(*(source or (-1, -1)), *(pending or (-1, -1)), rings))
+    return b"".join(parts)
+
+def unpack_state(data, player, monsters, field):
+    """ Restore pack_state() output into existing objects (the same maze and monster count) """
+    player.x, player.y, player.move_cooldown = _PLAYER.unpack_from(data, 0)
+    offset = _PLAYER.size
+    source = _SOURCE.unpack_from(data, offset)
+    offset += _SOURCE.size
+    count, = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    if count != len(monsters):
+        raise ValueError(f"snapshot has {count} monsters, the game has {len(monsters)}")
+
+    cols = monsters.cols
+    occupancy = monsters.occupancy
+    for i in range(count):
+        occupancy[monsters.ys[i] * cols + monsters.xs[i]] -= 1
+        x, y, tx, ty, progress, state = _MONSTER.unpack_from(data, offset)
+        offset += _MONSTER.size
+        monsters.xs[i], monsters.ys[i] = x, y
+        monsters.target_xs[i], monsters.target_ys[i] = tx, ty
+        monsters.progress[i] = progress
+        monsters.states[i] = state
+        occupancy[y * cols + x] += 1
+    # The field is a pure function of its source, so one BFS rebuilds it exactly
+    if field is not None and source != (-1, -1):
+        field.compute(source)
+    if field is not None and field.far is not None:
+        fx, fy, px, py, rings = _FAR.unpack_from(data, offset)
+        field.far.restore((fx, fy) if fx >= 0 else None, (px, py) if px >= 0 else None, rings)
+
+
+# ------------------ Recording ------------------
+
+class ReplayWriter:
+    """ Appends one game to a replay log as it is played """
+
+    def __init__(self, path, tick_rate, maze, endless=False, field_radius=None):
+        self.path = path
+        self.file = open(path, "wb")
+        self.last_move_tick = 0
+        flags = (FLAG_ENDLESS if endless else 0) | (FLAG_NUMPY if getattr(maze, "backend", "prim") == "numpy" else 0)
+        cols, rows = (0, 0) if endless else (maze.cols, maze.rows)
+        self.file.write(HEADER.pack(MAGIC, VERSION, flags, tick_rate, cols, rows, maze.seed, field_radius or 0))
+
+    @classmethod
+    def in_directory(cls, directory, tick_rate, maze, endless=False, field_radius=None):
+        """ New log named after the current time and the maze seed """
+        os.makedirs(directory, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{maze.seed}.mzr"
+        return cls(os.path.join(directory, name), tick_rate, maze, endless, field_radius)
+
+    def spawn(self, positions):
+        self.file.write(b"S" + _COUNT.pack(len(positions)) + b"".join(SPAWN.pack(x, y) for x, y in positions))
+
+    def move(self, tick, dx, dy):
+        delta = tick - self.last_move_tick
+        self.last_move_tick = tick
+        self.file.write(b"M" + write_varint(delta << 2 | DIRECTIONS.index((dx, dy))))
+
+    def snapshot(self, tick, state):
+        if state is not None:
+            self.file.write(b"K" + SNAPSHOT.pack(tick, len(state)) + state)
+            self.file.flush()
+
+    def end(self, tick, result):
+        self.file.write(b"E" + END.pack(tick, RESULTS.index(result)))
+        self.close()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+# ------------------ Reading ------------------
+
+class Replay:
+    """ A parsed replay log. A truncated tail (crashed game) is ignored and end stays None """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            buf = f.read()
+        magic, version, flags, self.tick_rate, self.cols, self.rows, self.seed, radius = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a replay log")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay format version {version}")
+        self.path = path
+        self.endless = bool(flags & FLAG_ENDLESS)
+        self.backend = "numpy" if flags & FLAG_NUMPY else "prim"
+        self.field_radius = radius or None  # the recorded game's, so monsters decide the same way
+        self.spawns = []
+        self.moves = []  # (tick, dx, dy) in press order
+        self.snapshots = []  # (tick, state) in tick order
+        self.end = None  # (tick, result)
+        self._parse(buf, HEADER.size)
+
+    def _parse(self, buf, offset):
+        tick = 0
+        try:
+            while offset < len(buf):
+                tag = buf[offset:offset + 1]
+                offset += 1
+                if tag == b"M":
+                    value, offset = read_varint(buf, offset)
+                    tick += value >> 2
+                    self.moves.append((tick,) + DIRECTIONS[value & 3])
+                elif tag == b"S":
+                    count, = _COUNT.unpack_from(buf, offset)
+                    offset += _COUNT.size
+                    self.spawns = [SPAWN.unpack_from(buf, offset + i * SPAWN.size) for i in range(count)]
+                    offset += count * SPAWN.size
+                elif tag == b"K":
+                    at, length = SNAPSHOT.unpack_from(buf, offset)
+                    offset += SNAPSHOT.size
+                    if offset + length > len(buf):
+                        break
+                    self.snapshots.append((at, bytes(buf[offset:offset + length])))
+                    offset += length
+                elif tag == b"E":
+                    at, result = END.unpack_from(buf, offset)
+                    self.end = (at, RESULTS[result])
+                    break
+                else:
+                    raise ValueError(f"corrupt replay log {self.path} at byte {offset - 1}")
+        except (IndexError, struct.error):
+            pass  # record cut off mid-write
+
+    @property
+    def last_tick(self):
+        """ Tick of the last thing the log knows about """
+        if self.end:
+            return self.end[0]
+        return max(self.moves[-1][0] if self.moves else 0, self.snapshots[-1][0] if self.snapshots else 0)
+
+    def build_maze(self, cell_size):
+        """ The recorded maze, regenerated from its seed """
+        if self.endless:
+            return ChunkedMaze(cell_size, seed=self.seed)
+        maze = Maze(self.cols, self.rows, cell_size, seed=self.seed, backend=self.backend)
+        maze.generate_maze()
+        return maze
+
+    def build_monsters(self, maze, cell_size, image_path=None):
+        """ Monsters at the recorded spawn cells (pass image_path only when drawing) """
+        if self.endless:
+            monsters = MonsterList(maze, cell_size, image_path=image_path, rng=random.Random(self.seed))
+        else:
+            monsters = MonsterGroup(maze, cell_size, image_path=image_path)
+        for x, y in self.spawns:
+            monsters.add(x, y)
+        return monsters
+
+
+class MoveCursor:
+    """ Walks the recorded moves in step with a sim tick counter """
+
+    def __init__(self, moves, tick=0):
+        self.moves = moves
+        self.index = bisect.bisect_left(moves, (tick,))
+
+    def due(self, tick):
+        """ Moves pressed before the tick after `tick` ran, consumed in order """
+        moves = self.moves
+        start = self.index
+        while self.index < len(moves) and moves[self.index][0] <= tick:
+            self.index += 1
+        return moves[start:self.index]
+
+
+# ------------------ Headless playback ------------------
+
+class ReplaySim:
+    """ Re-simulates a replay with no window at full speed, tick for tick in the order of
+    Game.tick_gameplay. Seeking resumes from the nearest snapshot at or before the target. """
+
+    def __init__(self, replay, snapshot_interval=SNAPSHOT_INTERVAL):
+        self.replay = replay
+        self.dt = 1.0 / replay.tick_rate
+        self.maze = replay.build_maze(1)
+        self.exit = None if replay.endless else (self.maze.cols - 1, self.maze.rows - 2)
+        self.player = Player(1, 1, 1, image_path=None)
+        self.monsters = replay.build_monsters(self.maze, 1)
+        self.field = None if replay.endless else DistanceField(self.maze, replay.field_radius)
+        if self.field is not None:
+            self.field.update((1, 1))  # as Game.initialize_game
+        self.snapshot_interval = snapshot_interval
+        self.snapshots = dict(replay.snapshots)  # plus the ones taken while playing, for seeking back
+        self.start = pack_state(self.player, self.monsters, self.field)
+        self.cursor = MoveCursor(replay.moves)
+        self.tick = 0
+        self.result = None
+
+    def step(self):
+        """ Advance one tick: recorded moves, player, monsters, collisions """
+        for _, dx, dy in self.cursor.due(self.tick):
+            self.player.move(dx, dy, self.maze)
+        self.player.update(self.dt)
+
+        player_pos = (self.player.x, self.player.y)
+        if self.field is not None:
+            self.field.update(player_pos, self.monsters.replan_distance)
+        self.monsters.update(player_pos, self.dt, self.field)
+        self.tick += 1
+
+        if self.monsters.occupies(player_pos):
+            self.result = "caught"
+        elif self.replay.endless:
+            self.maze.prefetch(*player_pos)
+        elif player_pos == self.exit:
+            self.result = "escaped"
+        elif self.tick % self.snapshot_interval == 0 and self.tick not in self.snapshots:
+            self.snapshots[self.tick] = pack_state(self.player, self.monsters, self.field)
+        return self.result
+
+    def restore(self, tick, state):
+        unpack_state(state, self.player, self.monsters, self.field)
+        self.cursor = MoveCursor(self.replay.moves, tick)
+        self.tick = tick
+        self.result = None
+
+    def seek(self, tick):
+        """ Jump to a tick boundary: restore the latest snapshot at or before it unless the
+        current position is closer, then simulate the rest """
+        tick = min(tick, self.replay.last_tick)
+        if self.start is None:
+            if tick < self.tick:
+                self.__init__(self.replay, self.snapshot_interval)  # endless: no snapshots, start over
+        else:
+            best = max((t for t in self.snapshots if t <= tick), default=0)
+            if tick < self.tick or best > self.tick:
+                self.restore(best, self.snapshots[best] if best else self.start)
+        while self.tick < tick and self.result is None:
+            self.step()
+        return self.tick
+
+    def run(self, check=False):
+        """ Play to the end of the log. With check, every tick verifies that nobody stands in a
+        wall and that grid monsters moved at most one cell (endless respawns teleport, and the
+        player can press several keys between ticks); problems are (tick, who, from, to) """
+        last = self.replay.last_tick
+        problems = []
+        before = self.positions() if check else None
+        while self.result is None and self.tick < last:
+            self.step()
+            if check:
+                after = self.positions()
+                for who, (old, new) in enumerate(zip(before, after)):
+                    jumped = who > 0 and not self.replay.endless and abs(new[0] - old[0]) + abs(new[1] - old[1]) > 1
+                    if jumped or not self.maze.is_open(*new):
+                        problems.append((self.tick, f"monster {who - 1}" if who else "player", old, new))
+                before = after
+        return {"result": self.result or ("quit" if self.replay.end else "truncated"), "ticks": self.tick,
+                "problems": problems}
+
+    def positions(self):
+        return [(self.player.x, self.player.y)] + self.monsters.positions()
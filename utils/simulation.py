@@ -0,0 +1,147 @@
+import random
+
+from utils.maze_generator import Maze
+from utils.player import Player
+from utils.monster import MonsterGroup
+from utils.flow_field import DistanceField
+
+# Same maze size as the windowed game (MAZE_WIDTH 600 px / CELL_SIZE 20)
+DEFAULT_SIZE = 31
+SIM_DT = 1 / 60  # fixed simulated timestep in seconds
+
+
+# ------------------ Player policies ------------------
+# A policy looks at the simulation and returns the (dx, dy) it wants to press, or None
+
+def exit_policy(sim):
+    """ Always take the shortest path to the exit """
+    step = sim.exit_field.next_step((sim.player.x, sim.player.y))
+    if step is None:
+        return None
+    return step[0] - sim.player.x, step[1] - sim.player.y
+
+def random_policy(sim):
+    """ Wander like a lost player """
+    return sim.rng.choice(((1, 0), (-1, 0), (0, 1), (0, -1)))
+
+def evade_policy(sim, danger=3):
+    """ Head for the exit, but pick the neighbour furthest from monsters when one is close """
+    px, py = sim.player.x, sim.player.y
+    monsters = sim.monsters.positions()
+    nearest = min((abs(mx - px) + abs(my - py) for mx, my in monsters), default=danger + 1)
+    if nearest > danger:
+        return exit_policy(sim)
+
+    best, best_score = None, None
+    for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+        nx, ny = px + dx, py + dy
+        exit_distance = sim.exit_field.distance((nx, ny))
+        if exit_distance < 0:
+            continue  # wall or outside the maze
+        threat = min(abs(mx - nx) + abs(my - ny) for mx, my in monsters)
+        score = (threat, -exit_distance)
+        if best_score is None or score > best_score:
+            best, best_score = (dx, dy), score
+    return best
+
+POLICIES = {
+    "exit": exit_policy,
+    "random": random_policy,
+    "evade": evade_policy,
+}
+
+
+class HeadlessSim:
+    """ One chase episode on a fixed timestep, with no window, clock or assets """
+
+    def __init__(self, seed, size=DEFAULT_SIZE, monster_count=1, policy="exit",
+                 player_speed=6.0, time_limit=120.0, dt=SIM_DT, speeds=None, thresholds=None,
+                 replan_distance=None, maze=None, backend="prim", field_radius=None):
+        self.seed = seed
+        self.rng = random.Random(seed)  # spawns and the player policy
+        self.dt = dt
+        self.time_limit = time_limit
+        self.policy = POLICIES[policy] if isinstance(policy, str) else policy
+
+        if maze is None:
+            maze = Maze(size, size, 1, seed=seed, backend=backend)
+            maze.generate_maze()
+        self.maze = maze
+        self.exit = (self.maze.cols - 1, self.maze.rows - 2)
+
+        self.player = Player(1, 1, 1, image_path=None)
+        self.player.move_delay = 1.0 / player_speed  # a human needs time between key presses
+
+        self.monsters = MonsterGroup(self.maze, 1, image_path=None)
+        if speeds:
+            self.monsters.speeds.update(speeds)
+        if thresholds:
+            self.monsters.thresholds = tuple(thresholds)
+        if replan_distance is not None:
+            self.monsters.replan_distance = replan_distance
+        self.monsters.spawn_random(self.maze, self.rng, monster_count, max_distance=field_radius)
+
+        # From the player, shared by monsters; whole maze unless a radius is given (see Game.field_radius)
+        self.field = DistanceField(self.maze, field_radius)
+        self.exit_field = DistanceField(self.maze)  # from the exit, used by policies
+        if getattr(self.maze, "exit_distances", None) is not None:
+            self.exit_field.load(self.exit, self.maze.exit_distances)  # precomputed in a maze pack
+        else:
+            self.exit_field.update(self.exit)
+
+        self.tick = 0
+        self.result = None
+
+    @property
+    def time(self):
+        return self.tick * self.dt
+
+    def step(self):
+        """ Advance one tick, same order as Game: input, player, monsters, collisions """
+        if self.player.move_cooldown <= 0:
+            move = self.policy(self)
+            if move:
+                self.player.move(move[0], move[1], self.maze)
+        self.player.update(self.dt)
+
+        player_pos = (self.player.x, self.player.y)
+        self.field.update(player_pos, self.monsters.replan_distance)
+        self.monsters.update(player_pos, self.dt, self.field)
+        self.tick += 1
+
+        if self.monsters.occupies(player_pos):
+            self.result = "caught"
+        elif player_pos == self.exit:
+            self.result = "escaped"
+        elif self.time >= self.time_limit:
+            self.result = "timeout"
+        return self.result
+
+    def run(self):
+        while self.result is None:
+            self.step()
+        return {"seed": self.seed, "result": self.result, "time": self.time, "ticks": self.tick}
+
+
+def run_episodes(episodes, seed=0, pack=None, **options):
+    """ Run seeded episodes back to back; episode i uses seed + i.
+    With a MazePack, episode i plays pack[i % len(pack)] instead of generating a maze. """
+    if pack is not None:
+        return [HeadlessSim(seed + i, maze=pack[i % len(pack)], **options).run() for i in range(episodes)]
+    return [HeadlessSim(seed + i, **options).run() for i in range(episodes)]
+
+def summarize(results):
+    """ Capture rate and escape-time stats for a list of episode results """
+    total = len(results)
+    caught = sum(r["result"] == "caught" for r in results)
+    escape_times = sorted(r["time"] for r in results if r["result"] == "escaped")
+    summary = {
+        "episodes": total,
+        "caught": caught,
+        "escaped": len(escape_times),
+        "timeout": total - caught - len(escape_times),
+        "capture_rate": caught / total if total else 0.0,
+        "mean_escape_time": sum(escape_times) / len(escape_times) if escape_times else None,
+        "median_escape_time": escape_times[len(escape_times) // 2] if escape_times else None,
+    }
+    return summary
@@ -0,0 +1,28 @@
+from collections import OrderedDict
+
+class TextCache:
+    """ LRU of rendered text surfaces keyed by (font, text, colour), so static labels and
+    slowly changing values (timer, progress) are rendered once instead of every frame """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            surface = font.render(text, antialias, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)  # least recently used
+        else:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
@@ -0,0 +1,114 @@
+import itertools
+import json
+import os
+from multiprocessing import Pool
+
+from utils.simulation import HeadlessSim, summarize
+
+# Parameters a tournament can sweep, mapped to how HeadlessSim receives them
+SPEED_PARAMS = ("idle", "alert", "chase", "frenzy")
+THRESHOLD_PARAMS = ("far", "near", "close")  # idle above far, alert above near, chase above close
+
+
+def build_grid(sweep):
+    """ Cartesian product of {name: [values]} -> list of {name: value} configs """
+    names = sorted(sweep)
+    return [dict(zip(names, values)) for values in itertools.product(*(sweep[n] for n in names))]
+
+def config_key(config, options):
+    """ Stable id of one configuration, used to resume a sweep """
+    return json.dumps({"params": config, "options": options}, sort_keys=True)
+
+def sim_kwargs(config, options):
+    """ Turn a flat config into HeadlessSim keyword arguments """
+    kwargs = dict(options)
+    speeds = {name: config[name] for name in SPEED_PARAMS if name in config}
+    if speeds:
+        kwargs["speeds"] = speeds
+    if any(name in config for name in THRESHOLD_PARAMS):
+        defaults = dict(zip(THRESHOLD_PARAMS, (15, 10, 5)))
+        defaults.update({name: config[name] for name in THRESHOLD_PARAMS if name in config})
+        kwargs["thresholds"] = tuple(defaults[name] for name in THRESHOLD_PARAMS)
+    if "replan" in config:
+        kwargs["replan_distance"] = config["replan"]
+    return kwargs
+
+
+def run_chunk(job):
+    """ Worker: run one block of seeded episodes for one config (must be top level to pickle) """
+    key, config, options, seeds = job
+    kwargs = sim_kwargs(config, options)
+    rows = []
+    for seed in seeds:
+        result = HeadlessSim(seed, **kwargs).run()
+        rows.append({"key": key, "params": config, **result})
+    return rows
+
+
+def load_done(path):
+    """ (key, seed) pairs already in the results file; a torn last line is ignored """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            done.add((row["key"], row["seed"]))
+    return done
+
+def load_results(path):
+    results = {}
+    with open(path) as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            results.setdefault(row["key"], []).append(row)
+    return results
+
+
+def run_tournament(sweep, episodes, out_path, seed=0, options=None, jobs=None, chunk_size=25, progress=None):
+    """ Run every config in the sweep for `episodes` seeds, appending rows to out_path as they finish.
+
+    Episodes already present in out_path are skipped, so an interrupted sweep resumes where it stopped.
+    Returns {key: summary} for every config.
+    """
+    options = options or {}
+    configs = build_grid(sweep)
+    done = load_done(out_path)
+
+    work = []
+    for config in configs:
+        key = config_key(config, options)
+        seeds = [s for s in range(seed, seed + episodes) if (key, s) not in done]
+        for i in range(0, len(seeds), chunk_size):
+            work.append((key, config, options, seeds[i:i + chunk_size]))
+
+    if work:
+        # Truncated last line from a killed run would glue onto our first row
+        if os.path.exists(out_path) and os.path.getsize(out_path):
+            with open(out_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+            if needs_newline:
+                with open(out_path, "a") as f:
+                    f.write("\n")
+
+        with open(out_path, "a") as out, Pool(processes=jobs or os.cpu_count()) as pool:
+            for finished, rows in enumerate(pool.imap_unordered(run_chunk, work), 1):
+                out.write("".join(json.dumps(row) + "\n" for row in rows))
+                out.flush()  # each finished chunk survives an interrupt
+                if progress:
+                    progress(finished, len(work))
+
+    results = load_results(out_path)
+    summaries = {}
+    for config in configs:
+        key = config_key(config, options)
+        rows = [r for r in results.get(key, []) if seed <= r["seed"] < seed + episodes]
+        summaries[key] = {"params": config, **summarize(rows)}
+    return summaries